@@ -5,8 +5,10 @@
 
 import os
 import shutil
+import sqlite3
 from datetime import datetime
 from typing import List, Tuple
+from report_cache import ReportCache
 
 
 class BackupManager:
@@ -43,14 +45,37 @@ class BackupManager:
             backup_filename = f"calendar_plans_backup_{timestamp}.db"
             backup_path = os.path.join(self.backup_dir, backup_filename)
             
-            # Копируем файл БД
-            shutil.copy2(self.db_path, backup_path)
+            # Копируем БД
+            self._copy_database(self.db_path, backup_path)
             
             return True, backup_path
         
         except Exception as e:
             return False, f"Ошибка при создании резервной копии: {str(e)}"
     
+    @staticmethod
+    def _copy_database(source_path: str, target_path: str):
+        """
+        Скопировать БД средствами SQLite (backup API)
+        
+        В режиме WAL последние изменения могут находиться в файле журнала,
+        поэтому простое копирование файла БД их теряет, а запись поверх
+        открытой БД её повреждает. Backup API учитывает журнал и блокировки.
+        
+        Args:
+            source_path: Путь к исходной БД
+            target_path: Путь к БД, в которую копируются данные
+        """
+        source = sqlite3.connect(source_path)
+        try:
+            target = sqlite3.connect(target_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    
     def get_backups(self) -> List[Tuple[str, str, int]]:
         """
         Получить список доступных резервных копий
@@ -105,10 +130,14 @@ class BackupManager:
             if os.path.exists(self.db_path):
                 current_backup = f"before_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
                 current_backup_path = os.path.join(self.backup_dir, current_backup)
-                shutil.copy2(self.db_path, current_backup_path)
+                self._copy_database(self.db_path, current_backup_path)
             
             # Восстанавливаем из бэкапа
-            shutil.copy2(backup_path, self.db_path)
+            self._copy_database(backup_path, self.db_path)
+            
+            # Счётчик записей восстановленной БД может совпасть со счётчиком
+            # других данных - отчёты, сохранённые на диске, больше не годятся
+            shutil.rmtree(ReportCache.directory_for(self.db_path), ignore_errors=True)
             
             return True, "База данных успешно восстановлена"
         
@@ -12,15 +12,17 @@ from styles import apply_styles, COLORS, create_styled_button
 class BackupWindow:
     """Класс окна управления резервными копиями"""
     
-    def __init__(self, parent, db_path: str = "calendar_plans.db"):
+    def __init__(self, parent, db_path: str = "calendar_plans.db", callback=None):
         """
         Инициализация окна
         
         Args:
             parent: Родительское окно
             db_path: Путь к файлу БД
+            callback: Функция, вызываемая после восстановления БД
         """
         self.parent = parent
+        self.callback = callback
         self.backup_manager = BackupManager(db_path)
         
         # Создаём окно
@@ -217,6 +219,8 @@ class BackupWindow:
         success, message = self.backup_manager.restore_backup(filename)
         
         if success:
+            if self.callback:
+                self.callback()
             messagebox.showinfo("Успех", f"{message}\n\nПерезапустите программу для применения изменений.")
             self.window.destroy()
         else:
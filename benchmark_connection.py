@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Сравнение профилей подключения к БД (CONNECTION_PROFILES)
+
+Для каждого профиля создаёт временную БД и замеряет:
+  - запись: добавление мероприятий по одному (commit на каждое, как в окнах);
+  - чтение: загрузку мероприятий года из SQLite (без кэша Database), как при открытии отчётов.
+
+Запуск: python benchmark_connection.py [кол-во мероприятий] [кол-во чтений]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from database import Database, CONNECTION_PROFILES
+
+
+MONTHS_CYCLE = ['Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+                'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь']
+
+
+def benchmark_profile(profile: str, events_count: int, reads_count: int) -> dict:
+    """
+    Замерить запись и чтение для одного профиля
+    
+    Returns:
+        Словарь со средним временем записи и чтения в миллисекундах
+    """
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, 'benchmark.db')
+    # Без кэша мероприятий: каждое чтение года идёт в SQLite
+    db = Database(db_path, profile=profile, event_cache=False)
+    # Временная БД - единственное подключение, режим журнала можно сменить
+    db.set_journal_mode(CONNECTION_PROFILES[profile]['journal_mode'])
+    try:
+        start = time.perf_counter()
+        for i in range(events_count):
+            db.add_event(
+                2025, "Бокс", "Выездное" if i % 3 else "Внутреннее",
+                f"Первенство №{i}", "Новый Уренгой", MONTHS_CYCLE[i % 12],
+                10000.0, [{"name": "Тренер 1", "budget": 5000.0}]
+            )
+        write_ms = (time.perf_counter() - start) * 1000 / events_count
+        
+        start = time.perf_counter()
+        for _ in range(reads_count):
+            db.get_events_by_year(2025)
+        read_ms = (time.perf_counter() - start) * 1000 / reads_count
+        
+        return {'write_ms': write_ms, 'read_ms': read_ms}
+    finally:
+        db.close()
+        for filename in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, filename))
+        os.rmdir(temp_dir)
+
+
+if __name__ == "__main__":
+    events_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reads_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    
+    print("=" * 60)
+    print(f"ПРОФИЛИ ПОДКЛЮЧЕНИЯ: {events_count} записей, {reads_count} чтений года")
+    print("=" * 60)
+    
+    results = {}
+    for profile in CONNECTION_PROFILES:
+        results[profile] = benchmark_profile(profile, events_count, reads_count)
+    
+    base = results['default']
+    print(f"{'Профиль':<10} {'Запись, мс':>12} {'Чтение, мс':>12} {'Запись':>10} {'Чтение':>10}")
+    for profile, result in results.items():
+        print(f"{profile:<10} {result['write_ms']:>12.3f} {result['read_ms']:>12.3f} "
+              f"{base['write_ms'] / result['write_ms']:>9.1f}x {base['read_ms'] / result['read_ms']:>9.1f}x")
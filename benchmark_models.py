@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Замер памяти и времени создания моделей Event
+
+Сравнивает текущую модель (__slots__, JSON тренеров разбирается при первом
+обращении) с прежней схемой (атрибуты в __dict__, оба JSON разбираются
+сразу) на наборе строк БД. Память считается через tracemalloc.
+
+Запуск: python benchmark_models.py [кол-во строк]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from models import Event
+
+
+class DictEvent:
+    """Прежняя схема модели: атрибуты в __dict__, JSON разбирается сразу"""
+    
+    def __init__(self, row: tuple):
+        (self.id, self.year, self.sport, self.event_type, self.name, self.location,
+         self.month, self.children_budget, self.trainers_count, self.trainers_budget,
+         self.notes, self.status, self.actual_start_date, self.actual_end_date,
+         self.actual_children_budget, self.actual_trainers_budget,
+         self.cancellation_reason, self.postponement_reason, self.is_favorite,
+         self.last_modified, self.trainers_json, self.actual_trainers_json) = row
+        self.trainers_list = json.loads(self.trainers_json) if self.trainers_json else []
+        self.actual_trainers_list = json.loads(self.actual_trainers_json) if self.actual_trainers_json else []
+
+
+def make_rows(count: int) -> list:
+    """Строки в формате get_events_by_year (у части - фактические тренеры)"""
+    trainers = json.dumps([{"name": "Иванов И.И.", "budget": 15000.0},
+                           {"name": "Петров П.П.", "budget": 12000.0}], ensure_ascii=False)
+    actual = json.dumps([{"name": "Иванов И.И.", "budget": 14000.0}], ensure_ascii=False)
+    return [
+        (i, 2025, "Бокс", "Выездное", f"Первенство №{i}", "Новый Уренгой", "Май",
+         100000.0, 2, 27000.0, "", "Проведено" if i % 3 == 0 else "Запланировано",
+         None, None, None, None, None, None, 0, "2025-01-01T10:00:00",
+         trainers, actual if i % 3 == 0 else None)
+        for i in range(count)
+    ]
+
+
+def measure(build, rows: list) -> dict:
+    """
+    Построить модели по всем строкам
+    
+    Returns:
+        Словарь: время (мс) и память (МБ), занятая построенными объектами
+    """
+    # Время - без tracemalloc (он замедляет каждое выделение памяти)
+    start = time.perf_counter()
+    objects = [build(row) for row in rows]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    del objects
+    
+    tracemalloc.start()
+    objects = [build(row) for row in rows]
+    memory_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+    del objects
+    return {'time_ms': elapsed_ms, 'memory_mb': memory_mb}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = make_rows(count)
+    
+    print("=" * 60)
+    print(f"МОДЕЛИ МЕРОПРИЯТИЙ: {count} строк")
+    print("=" * 60)
+    
+    results = {
+        '__dict__, JSON сразу': measure(DictEvent, rows),
+        '__slots__, JSON лениво': measure(Event.from_db_row, rows),
+    }
+    
+    # Отдельно: полный разбор тренеров у всех (как при построении отчёта)
+    events = [Event.from_db_row(row) for row in rows]
+    start = time.perf_counter()
+    for event in events:
+        event.trainers_list
+        event.actual_trainers_list
+    decode_ms = (time.perf_counter() - start) * 1000
+    
+    base = results['__dict__, JSON сразу']
+    print(f"{'Модель':<24} {'Время, мс':>10} {'Память, МБ':>11} {'Время':>8} {'Память':>8}")
+    for name, result in results.items():
+        print(f"{name:<24} {result['time_ms']:>10.1f} {result['memory_mb']:>11.1f} "
+              f"{base['time_ms'] / result['time_ms']:>7.1f}x {base['memory_mb'] / result['memory_mb']:>7.1f}x")
+    print(f"\nРазбор JSON тренеров при первом обращении ко всем: {decode_ms:.1f} мс")
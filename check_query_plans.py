@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Проверка планов выполнения запросов (EXPLAIN QUERY PLAN)
+
+Выполняет все публичные запросы чтения Database на временной БД,
+перехватывает их SQL и проверяет, что ни один не читает таблицу
+полным сканированием, а списки мероприятий и статей расходов читаются
+из индекса без отдельной сортировки. Завершается с кодом 1 при нарушении.
+
+Запуск: python check_query_plans.py
+"""
+
+import os
+import sys
+import tempfile
+from database import Database
+
+
+# Полный просмотр индекса допустим только там, где нужны все значения столбца
+ALLOWED_INDEX_SCANS = {
+    'get_all_years',
+}
+
+# Запросы, строки которых должны идти в порядке индекса (без сортировки)
+INDEX_ORDERED_QUERIES = {
+    'get_events_by_year',
+    'get_favorite_events',
+    'get_estimate_items',
+}
+
+
+def fill_sample_data(db: Database):
+    """Заполнить БД небольшим набором данных, чтобы запросы что-то возвращали"""
+    event_ids = []
+    for year in (2024, 2025):
+        for month, event_type in (("Январь", "Выездное"), ("Май", "Внутреннее"), ("Октябрь", "Выездное")):
+            event_ids.append(db.add_event(
+                year, "Бокс", event_type, f"Первенство {month}", "Новый Уренгой", month,
+                10000.0, [{"name": "Тренер 1", "budget": 5000.0}]
+            ))
+    
+    for event_id in event_ids:
+        for estimate_type in ("ППО", "УЭВП"):
+            estimate_id = db.create_estimate(event_id, estimate_type, "Тренер 1")
+            db.add_estimate_item(estimate_id, "Проезд", "", 2, 1, 1500.0)
+            db.add_estimate_item(estimate_id, "Суточные", "", 2, 3, 300.0)
+    
+    db.toggle_favorite(event_ids[0])
+    return event_ids
+
+
+def collect_queries(db: Database, event_id: int) -> list:
+    """
+    Выполнить публичные запросы чтения и собрать их SQL
+    
+    Returns:
+        Список (имя метода, SQL с подставленными параметрами)
+    """
+    estimate_id = db.get_estimates_by_event(event_id)[0][0]
+    calls = [
+        ('get_events_by_year', lambda: db.get_events_by_year(2025)),
+        ('get_year_stats', lambda: db.get_year_stats(2025)),
+        ('get_event_by_id', lambda: db.get_event_by_id(event_id)),
+        ('get_all_years', lambda: db.get_all_years()),
+        ('get_favorite_events', lambda: db.get_favorite_events(2025)),
+        ('get_estimates_by_event', lambda: db.get_estimates_by_event(event_id)),
+        ('get_estimate', lambda: db.get_estimate(estimate_id)),
+        ('get_estimate_items', lambda: db.get_estimate_items(estimate_id)),
+        ('get_year_estimates', lambda: db.get_year_estimates(2025)),
+    ]
+    
+    queries = []
+    for name, call in calls:
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            db.connection.set_trace_callback(None)
+        queries.extend((name, sql) for sql in statements if sql.lstrip().upper().startswith('SELECT'))
+    return queries
+
+
+def find_full_scans(db: Database, name: str, sql: str) -> list:
+    """
+    Найти шаги плана, читающие таблицу без индекса или сортирующие
+    результат там, где порядок должен давать индекс
+    
+    Returns:
+        Список проблемных строк плана
+    """
+    plan = db.connection.execute('EXPLAIN QUERY PLAN ' + sql).fetchall()
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if 'TEMP B-TREE FOR ORDER BY' in detail and name in INDEX_ORDERED_QUERIES:
+            problems.append(detail)
+            continue
+        if not detail.startswith('SCAN '):
+            continue
+        # Временные структуры (сортировка, DISTINCT) таблицами не являются
+        if 'TEMP B-TREE' in detail:
+            continue
+        if 'COVERING INDEX' in detail and name in ALLOWED_INDEX_SCANS:
+            continue
+        problems.append(detail)
+    return problems
+
+
+def check_query_plans() -> bool:
+    """
+    Проверить планы всех публичных запросов
+    
+    Returns:
+        True, если полных сканирований не найдено
+    """
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    db = Database(db_path)
+    try:
+        event_ids = fill_sample_data(db)
+        # Как на рабочей БД: у планировщика есть статистика по индексам
+        db.connection.execute('ANALYZE')
+        
+        ok = True
+        for name, sql in collect_queries(db, event_ids[-1]):
+            problems = find_full_scans(db, name, sql)
+            status = "OK" if not problems else "ПРОБЛЕМА"
+            print(f"  {name:.<35} {status}")
+            for detail in problems:
+                print(f"      {detail}")
+            ok = ok and not problems
+        return ok
+    finally:
+        db.close()
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ПРОВЕРКА ПЛАНОВ ЗАПРОСОВ")
+    print("=" * 60)
+    
+    if check_query_plans():
+        print("\nВсе запросы используют индексы.")
+    else:
+        print("\nЕсть запросы с полным сканированием или лишней сортировкой!")
+        sys.exit(1)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Чтение CSV файлов с автоопределением формата
+
+Кодировка, разделитель и кавычки определяются один раз по началу файла
+(ограниченный образец), после чего строки читаются потоком без загрузки
+всего файла в память.
+"""
+
+import codecs
+import csv
+import io
+import os
+from itertools import islice
+from typing import Dict, Iterator, List
+
+
+class CSVSource:
+    """CSV файл с определённым форматом"""
+    
+    # Размер образца начала файла для определения формата (байт)
+    SAMPLE_SIZE = 64 * 1024
+    
+    # Кодировки в порядке проверки. cp1251 не декодирует байт 0x98,
+    # поэтому последней идёт latin-1 - она принимает любые байты
+    ENCODINGS = ['utf-8-sig', 'cp1251', 'latin-1']
+    
+    # Допустимые разделители в порядке предпочтения
+    DELIMITERS = [';', ',', '\t', '|']
+    
+    def __init__(self, file_path: str):
+        """
+        Определить формат файла по образцу его начала
+        
+        Args:
+            file_path: Путь к CSV файлу
+        
+        Raises:
+            ValueError: Если формат определить не удалось
+        """
+        self.file_path = file_path
+        self.file_size = os.path.getsize(file_path)
+        
+        with open(file_path, 'rb') as f:
+            raw_sample = f.read(self.SAMPLE_SIZE)
+        whole_file = len(raw_sample) >= self.file_size
+        
+        self.encoding, sample = self._detect_encoding(raw_sample, whole_file)
+        
+        # Последняя строка образца может быть обрезана
+        if not whole_file and '\n' in sample:
+            sample = sample[:sample.rindex('\n') + 1]
+        
+        self.dialect = self._detect_dialect(sample)
+        
+        lines = [line for line in csv.reader(io.StringIO(sample), self.dialect) if line]
+        if not lines:
+            raise ValueError("Не удалось определить формат файла. Попробуйте другой файл.")
+        self.headers: List[str] = lines[0]
+        
+        # Средний размер строки в образце - для оценки числа строк в файле
+        self._sample_rows = len(lines) - 1
+        self._sample_bytes = len(sample.encode(self.encoding, errors='replace'))
+    
+    @property
+    def delimiter(self) -> str:
+        """Разделитель полей"""
+        return self.dialect.delimiter
+    
+    def _detect_encoding(self, raw_sample: bytes, whole_file: bool):
+        """
+        Определить кодировку по образцу
+        
+        Returns:
+            Кортеж (кодировка, декодированный образец)
+        """
+        for encoding in self.ENCODINGS:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                # final=False: образец может обрываться посреди многобайтового символа
+                return encoding, decoder.decode(raw_sample, final=whole_file)
+            except UnicodeDecodeError:
+                continue
+        raise ValueError("Не удалось определить кодировку файла.")
+    
+    def _detect_dialect(self, sample: str):
+        """
+        Определить разделитель и кавычки по образцу
+        
+        Разделитель выбирается тот, при котором больше всего строк образца
+        разбивается на столько же полей, сколько в заголовке (не меньше двух).
+        """
+        if not sample.strip():
+            raise ValueError("CSV файл пуст.")
+        
+        best_delimiter = None
+        best_score = 0
+        for delimiter in self.DELIMITERS:
+            # Разбор через csv.reader учитывает разделители внутри кавычек
+            rows = [row for row in csv.reader(io.StringIO(sample), delimiter=delimiter) if row]
+            header_width = len(rows[0])
+            if header_width < 2:
+                continue
+            score = sum(1 for row in rows if len(row) == header_width)
+            if score > best_score:
+                best_delimiter, best_score = delimiter, score
+        
+        if best_delimiter is None:
+            raise ValueError("Не удалось определить разделитель. Попробуйте другой файл.")
+        
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=best_delimiter)
+        except csv.Error:
+            dialect = csv.excel
+        if dialect.delimiter != best_delimiter:
+            dialect = csv.excel
+        
+        class DetectedDialect(dialect):
+            """Диалект файла с найденным разделителем"""
+            delimiter = best_delimiter
+            lineterminator = '\n'
+        
+        return DetectedDialect
+    
+    def estimate_rows(self) -> int:
+        """Оценка количества строк данных по размеру файла (для прогресса)"""
+        if self._sample_bytes == 0 or self._sample_rows == 0:
+            return 0
+        return max(self._sample_rows, round(self.file_size * self._sample_rows / self._sample_bytes))
+    
+    def rows(self) -> Iterator[Dict[str, str]]:
+        """
+        Прочитать строки данных потоком
+        
+        Yields:
+            Словари {заголовок: значение}
+        """
+        with open(self.file_path, 'r', encoding=self.encoding, newline='') as f:
+            yield from csv.DictReader(f, dialect=self.dialect)
+    
+    def head(self, count: int) -> List[Dict[str, str]]:
+        """Первые count строк данных (для предпросмотра)"""
+        return list(islice(self.rows(), count))
@@ -4,32 +4,307 @@
 """
 
 import sqlite3
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
 import os
 import json
 from datetime import datetime
+from urllib.request import pathname2url
+
+
+# Миграции схемы по порядку: (версия схемы после миграции, метод Database).
+# Текущая версия хранится в PRAGMA user_version, новые миграции добавляются в конец
+MIGRATIONS = [
+    (1, '_create_tables'),
+    (2, '_add_columns_if_not_exist'),
+    (3, '_migrate_trainers_to_json'),
+    (4, '_create_indexes'),
+    (5, '_add_sort_columns'),
+    (6, '_create_year_stats_index'),
+    (7, '_create_write_counter'),
+]
+
+# Порядковые номера месяцев (столбец events.month_num)
+MONTH_NUMBERS = {
+    'Январь': 1, 'Февраль': 2, 'Март': 3, 'Апрель': 4,
+    'Май': 5, 'Июнь': 6, 'Июль': 7, 'Август': 8,
+    'Сентябрь': 9, 'Октябрь': 10, 'Ноябрь': 11, 'Декабрь': 12
+}
+
+# Порядок категорий статей расходов (столбец estimate_items.category_order)
+CATEGORY_ORDER = {'Проезд': 1, 'Проживание': 2, 'Суточные': 3, 'Питание': 4}
+OTHER_CATEGORY_ORDER = 5
+
+# Профили подключения: timeout - сколько секунд ждать, пока БД занята
+# другим оператором; pragmas - настройки SQLite, выполняемые при подключении;
+# journal_mode - режим журнала, на который рассчитан профиль.
+# Режим журнала хранится в файле БД и действует для всех операторов, поэтому
+# при подключении он не меняется - только явным вызовом set_journal_mode
+CONNECTION_PROFILES = {
+    # Настройки SQLite по умолчанию (журнал отката, как в ранних версиях)
+    'default': {
+        'timeout': 5.0,
+        'journal_mode': 'delete',
+        'pragmas': []
+    },
+    # Локальный диск, один оператор: журнал WAL (чтение не блокируется
+    # записью) и чтение через отображение файла в память. Размеры с запасом
+    # для БД в десятки МБ
+    'wal': {
+        'timeout': 15.0,
+        'journal_mode': 'wal',
+        'pragmas': [
+            ('synchronous', 'NORMAL'),    # в режиме WAL надёжно и без fsync на каждый commit
+            ('cache_size', -32000),       # 32 МБ (отрицательное значение - в КБ)
+            ('mmap_size', 128 * 1024 * 1024),
+            ('temp_store', 'MEMORY')
+        ]
+    },
+    # Сетевая папка: WAL требует общей памяти и на сетевых дисках не работает,
+    # поэтому журнал отката и более долгое ожидание блокировки
+    'shared': {
+        'timeout': 30.0,
+        'journal_mode': 'delete',
+        'pragmas': [
+            ('synchronous', 'FULL'),
+            ('cache_size', -32000),
+            ('temp_store', 'MEMORY')
+        ]
+    }
+}
+
+# Профиль по умолчанию - для БД в общей сетевой папке. Для локальной БД
+# одного оператора задайте переменную окружения CALENDAR_PLANS_DB_PROFILE=wal
+# и один раз включите WAL: Database(profile='wal').set_journal_mode('wal')
+DEFAULT_PROFILE = os.environ.get('CALENDAR_PLANS_DB_PROFILE', 'shared')
 
 
 class Database:
     """Класс для работы с базой данных календарных планов"""
     
-    def __init__(self, db_name: str = "calendar_plans.db"):
+    # Вставка мероприятия (общая для add_event и add_events_bulk)
+    _INSERT_EVENT_SQL = '''
+        INSERT INTO events (year, sport, event_type, name, location, month, 
+                          children_budget, trainers_count, trainers_budget, notes,
+                          trainers_json, last_modified, is_favorite, month_num)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
+    '''
+    
+    def __init__(self, db_name: str = "calendar_plans.db", profile: str = None,
+                 event_cache: bool = True, read_only: bool = False):
         """
         Инициализация подключения к БД
         
         Args:
             db_name: Имя файла базы данных
+            profile: Профиль подключения из CONNECTION_PROFILES
+                     (по умолчанию DEFAULT_PROFILE)
+            event_cache: Кэшировать мероприятия по годам (get_events_by_year)
+            read_only: Только чтение (для параллельной выгрузки отчётов):
+                       файл должен существовать, схема - быть актуальной,
+                       любая запись завершается ошибкой
         """
         self.db_name = db_name
+        self.profile = profile or DEFAULT_PROFILE
+        self.read_only = read_only
+        if self.profile not in CONNECTION_PROFILES:
+            raise ValueError(f"Неизвестный профиль подключения: {self.profile}")
         self.connection = None
         self.cursor = None
+        self._transaction_depth = 0  # Вложенность блоков transaction()
+        self._counted_changes = 0  # total_changes подключения на момент учёта в write_version
+        
+        # Кэш мероприятий: год -> строки get_events_by_year. Методы записи
+        # сбрасывают затронутые годы, запись других подключений - весь кэш
+        self.event_cache_enabled = event_cache
+        self._event_cache: Dict[int, List[tuple]] = {}
+        self._event_cache_version = None  # PRAGMA data_version при заполнении
+        self.event_cache_hits = 0
+        self.event_cache_misses = 0
+        
         self._connect()
-        self._create_tables()
+        if read_only:
+            self._check_schema()
+        else:
+            self._apply_migrations()
     
     def _connect(self):
-        """Установить соединение с БД"""
-        self.connection = sqlite3.connect(self.db_name)
+        """Установить соединение с БД и применить настройки профиля"""
+        settings = CONNECTION_PROFILES[self.profile]
+        # timeout - ожидание снятия блокировки другим процессом вместо
+        # немедленной ошибки "database is locked"
+        if self.read_only:
+            # mode=ro - файл не создаётся, если его нет
+            uri = f"file:{pathname2url(os.path.abspath(self.db_name))}?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True, timeout=settings['timeout'])
+        else:
+            self.connection = sqlite3.connect(self.db_name, timeout=settings['timeout'])
         self.cursor = self.connection.cursor()
+        
+        for name, value in settings['pragmas']:
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+        if self.read_only:
+            self.cursor.execute("PRAGMA query_only = ON")
+        
+        # Режим журнала файла только читаем (см. set_journal_mode)
+        self.journal_mode = self.cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    
+    def set_journal_mode(self, mode: str):
+        """
+        Переключить режим журнала файла БД
+        
+        Режим сохраняется в файле и действует для всех, кто работает с БД.
+        WAL ('wal') допустим только для локальной БД одного оператора: в общей
+        сетевой папке он не работает, а подключения с журналом отката
+        получают ошибку "database is locked". Вызывать явно и при
+        единственном подключении к БД.
+        
+        Args:
+            mode: Режим журнала ('wal', 'delete')
+        """
+        if self.read_only:
+            raise sqlite3.OperationalError("Подключение только для чтения")
+        mode = mode.lower()
+        result = self.cursor.execute(f"PRAGMA journal_mode = {mode}").fetchone()[0]
+        if result != mode:
+            raise sqlite3.OperationalError(
+                f"Не удалось переключить режим журнала на {mode} (текущий: {result})"
+            )
+        self.journal_mode = result
+    
+    @property
+    def data_version(self) -> tuple:
+        """
+        Версия данных для проверки актуальности кэшей
+        
+        Пара (число строк, изменённых через это подключение, включая запись
+        через self.cursor из окон приложения; PRAGMA data_version, который
+        меняется после commit других подключений - других операторов или
+        восстановления из резервной копии). Меняется при любой записи.
+        """
+        other_connections = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        return self.connection.total_changes, other_connections
+    
+    @property
+    def write_version(self) -> int:
+        """
+        Счётчик записей в БД
+        
+        Увеличивается при каждом commit, в котором методы Database что-то
+        изменили (одним UPDATE на транзакцию). Хранится в самой БД, поэтому
+        сравним между подключениями, процессами и запусками приложения
+        (ключ кэша отчётов). Запись в обход методов Database его не меняет.
+        """
+        return self.connection.execute("SELECT version FROM write_counter WHERE id = 1").fetchone()[0]
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Единица работы: все изменения внутри блока фиксируются одним commit
+        
+        Методы Database внутри блока не делают commit сами. При выходе из
+        внешнего блока выполняется commit, при исключении - rollback.
+        Блоки можно вкладывать друг в друга.
+        
+        Пример:
+            with db.transaction():
+                estimate_id = db.create_estimate(...)
+                db.add_estimate_item(estimate_id, ...)
+        """
+        if self._transaction_depth == 0 and not self.connection.in_transaction:
+            # Блокировку записи берём сразу: если БД занята другим оператором,
+            # ждём её (timeout профиля), а не получаем ошибку посреди работы
+            self.cursor.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.rollback()
+                self._counted_changes = self.connection.total_changes
+                # В кэш могли попасть незафиксированные данные
+                self.clear_event_cache()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self._count_write()
+            self.connection.commit()
+    
+    def _commit(self):
+        """Зафиксировать изменения, если не идёт блок transaction()"""
+        if self._transaction_depth == 0:
+            self._count_write()
+            self.connection.commit()
+    
+    def _count_write(self):
+        """Увеличить счётчик записей, если с прошлого commit были изменения"""
+        if self.connection.total_changes != self._counted_changes:
+            self.connection.execute('UPDATE write_counter SET version = version + 1 WHERE id = 1')
+            self._counted_changes = self.connection.total_changes
+    
+    # ==================== КЭШ МЕРОПРИЯТИЙ ====================
+    
+    def clear_event_cache(self):
+        """Сбросить кэш мероприятий за все годы"""
+        self._event_cache.clear()
+    
+    def _invalidate_years(self, *years: int):
+        """Сбросить кэш мероприятий за указанные годы"""
+        for year in years:
+            self._event_cache.pop(year, None)
+    
+    def _invalidate_event(self, event_id: int):
+        """Сбросить кэш года, к которому относится мероприятие (вызывать до изменения)"""
+        if not self._event_cache:
+            return
+        self.cursor.execute('SELECT year FROM events WHERE id = ?', (event_id,))
+        row = self.cursor.fetchone()
+        if row:
+            self._invalidate_years(row[0])
+    
+    def _check_event_cache(self):
+        """Сбросить кэш, если БД изменило другое подключение"""
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._event_cache_version:
+            self._event_cache.clear()
+            self._event_cache_version = version
+    
+    def _apply_migrations(self):
+        """
+        Применить недостающие миграции схемы
+        
+        Все миграции выполняются в одной транзакции. Если схема уже
+        актуальна (user_version не меньше последней миграции), БД не трогаем.
+        """
+        current_version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        pending = [(version, method) for version, method in MIGRATIONS if version > current_version]
+        if not pending:
+            return
+        
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Пока ждали блокировку, миграции мог выполнить другой оператор
+            current_version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+            pending = [(version, method) for version, method in pending if version > current_version]
+            for version, method in pending:
+                getattr(self, method)()
+            if pending:
+                # PRAGMA не поддерживает параметры запроса
+                self.cursor.execute(f"PRAGMA user_version = {pending[-1][0]}")
+            self._count_write()
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+    
+    def _check_schema(self):
+        """Проверить, что схема актуальна (миграции при чтении не выполняются)"""
+        current_version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if current_version < MIGRATIONS[-1][0]:
+            raise sqlite3.OperationalError(
+                f"Схема БД устарела (версия {current_version}), откройте её без read_only"
+            )
     
     def _create_tables(self):
         """Создать необходимые таблицы"""
@@ -87,11 +362,6 @@ class Database:
                 FOREIGN KEY (estimate_id) REFERENCES estimates(id) ON DELETE CASCADE
             )
         ''')
-        
-        self.connection.commit()
-        
-        # Добавляем новые столбцы если таблица уже существует
-        self._add_columns_if_not_exist()
     
     def _add_columns_if_not_exist(self):
         """Добавить новые столбцы в существующую таблицу"""
@@ -118,46 +388,114 @@ class Database:
             if column_name not in existing_columns:
                 try:
                     self.cursor.execute(f"ALTER TABLE events ADD COLUMN {column_name} {column_type}")
-                    self.connection.commit()
                 except Exception:
                     pass  # Столбец уже существует
-        
-        # Миграция данных тренеров в JSON формат
-        self._migrate_trainers_to_json()
     
     def _migrate_trainers_to_json(self):
-        """Миграция старых данных тренеров в JSON формат"""
-        try:
-            # Проверяем, есть ли записи без trainers_json
-            self.cursor.execute('''
-                SELECT id, trainers_count, trainers_budget 
-                FROM events 
-                WHERE trainers_json IS NULL OR trainers_json = ""
-            ''')
-            rows = self.cursor.fetchall()
-            
-            for event_id, count, budget in rows:
-                # Создаём JSON с тренерами
-                trainers = []
-                if count and count > 0:
-                    budget_per_trainer = budget / count if budget else 0
-                    for i in range(count):
-                        trainers.append({
-                            "name": f"Тренер {i+1}",
-                            "budget": budget_per_trainer
-                        })
-                
-                trainers_json = json.dumps(trainers, ensure_ascii=False)
-                self.cursor.execute('''
-                    UPDATE events 
-                    SET trainers_json = ?,
-                        last_modified = ?
-                    WHERE id = ?
-                ''', (trainers_json, datetime.now().isoformat(), event_id))
+        """
+        Миграция старых данных тренеров в JSON формат
+        
+        Заполняет trainers_json у мероприятий, где он пуст. Не делает commit:
+        вызывается внутри транзакции миграций (или вызывающий код коммитит сам)
+        """
+        # Проверяем, есть ли записи без trainers_json
+        self.cursor.execute('''
+            SELECT id, trainers_count, trainers_budget 
+            FROM events 
+            WHERE trainers_json IS NULL OR trainers_json = ""
+        ''')
+        rows = self.cursor.fetchall()
+        
+        for event_id, count, budget in rows:
+            # Создаём JSON с тренерами
+            trainers = []
+            if count and count > 0:
+                budget_per_trainer = budget / count if budget else 0
+                for i in range(count):
+                    trainers.append({
+                        "name": f"Тренер {i+1}",
+                        "budget": budget_per_trainer
+                    })
             
-            self.connection.commit()
-        except Exception as e:
-            pass  # Таблица может быть пустая или миграция уже выполнена
+            trainers_json = json.dumps(trainers, ensure_ascii=False)
+            self.cursor.execute('''
+                UPDATE events 
+                SET trainers_json = ?,
+                    last_modified = ?
+                WHERE id = ?
+            ''', (trainers_json, datetime.now().isoformat(), event_id))
+    
+    def _create_indexes(self):
+        """
+        Создать индексы для частых запросов
+        
+        Индекс смет по (event_id, estimate_type) используется и для выборки
+        всех смет мероприятия только по event_id
+        """
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_year ON events(year)')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_estimates_event_type
+            ON estimates(event_id, estimate_type)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_estimate_items_estimate
+            ON estimate_items(estimate_id)
+        ''')
+    
+    def _add_sort_columns(self):
+        """
+        Добавить столбцы порядка сортировки month_num и category_order
+        
+        Заменяют CASE по названиям месяцев и категорий в ORDER BY, чтобы
+        мероприятия года читались из индекса уже в нужном порядке
+        """
+        self.cursor.execute("PRAGMA table_info(events)")
+        if 'month_num' not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE events ADD COLUMN month_num INTEGER")
+        self.cursor.execute("PRAGMA table_info(estimate_items)")
+        if 'category_order' not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE estimate_items ADD COLUMN category_order INTEGER")
+        
+        # Заполняем для существующих записей
+        self.cursor.executemany('UPDATE events SET month_num = ? WHERE month = ?',
+                                [(num, month) for month, num in MONTH_NUMBERS.items()])
+        self.cursor.execute('UPDATE estimate_items SET category_order = ?', (OTHER_CATEGORY_ORDER,))
+        self.cursor.executemany('UPDATE estimate_items SET category_order = ? WHERE category = ?',
+                                [(order, category) for category, order in CATEGORY_ORDER.items()])
+        
+        # Индексы в порядке сортировки заменяют индексы только по году/смете
+        self.cursor.execute('DROP INDEX IF EXISTS idx_events_year')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_year_month
+            ON events(year, month_num, event_type, id)
+        ''')
+        self.cursor.execute('DROP INDEX IF EXISTS idx_estimate_items_estimate')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_estimate_items_order
+            ON estimate_items(estimate_id, category_order, id)
+        ''')
+    
+    def _create_year_stats_index(self):
+        """
+        Создать покрывающий индекс для статистики года (get_year_stats)
+        
+        Содержит все столбцы агрегирующего запроса, поэтому статистика
+        считается по индексу без чтения строк таблицы
+        """
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_year_stats
+            ON events(year, status, children_budget, trainers_budget)
+        ''')
+    
+    def _create_write_counter(self):
+        """Создать счётчик записей (см. write_version)"""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS write_counter (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        self.cursor.execute('INSERT OR IGNORE INTO write_counter (id, version) VALUES (1, 0)')
     
     def add_event(self, year: int, sport: str, event_type: str, name: str, 
                   location: str, month: str, children_budget: float, 
@@ -175,36 +513,112 @@ class Database:
         """
         # Обратная совместимость: если передан старый формат, конвертируем
         if trainers_list is None:
-            trainers_list = []
-            if trainers_count and trainers_count > 0:
-                budget_per_trainer = (trainers_budget or 0) / trainers_count
-                for i in range(trainers_count):
-                    trainers_list.append({
-                        "name": f"Тренер {i+1}",
-                        "budget": budget_per_trainer
-                    })
+            trainers_list = self.make_trainers_list(trainers_count, trainers_budget)
+        
+        self.cursor.execute(self._INSERT_EVENT_SQL, self._event_insert_params(
+            year, sport, event_type, name, location, month, children_budget,
+            trainers_list, notes, datetime.now().isoformat()
+        ))
+        self._invalidate_years(year)
+        self._commit()
+        return self.cursor.lastrowid
+    
+    @staticmethod
+    def make_trainers_list(trainers_count: int = None, trainers_budget: float = None) -> list:
+        """
+        Построить список тренеров по старому формату (количество и общая сумма)
         
+        Returns:
+            Список [{"name": "Тренер N", "budget": ...}, ...] с равными долями бюджета
+        """
+        trainers_list = []
+        if trainers_count and trainers_count > 0:
+            budget_per_trainer = (trainers_budget or 0) / trainers_count
+            for i in range(trainers_count):
+                trainers_list.append({
+                    "name": f"Тренер {i+1}",
+                    "budget": budget_per_trainer
+                })
+        return trainers_list
+    
+    @staticmethod
+    def _event_insert_params(year, sport, event_type, name, location, month,
+                             children_budget, trainers_list, notes, last_modified) -> tuple:
+        """Параметры для _INSERT_EVENT_SQL"""
         trainers_json = json.dumps(trainers_list, ensure_ascii=False)
         total_trainers_budget = sum(t.get('budget', 0) for t in trainers_list)
+        return (year, sport, event_type, name, location, month, children_budget,
+                len(trainers_list), total_trainers_budget, notes, trainers_json,
+                last_modified, MONTH_NUMBERS.get(month))
+    
+    def add_events_bulk(self, rows: Iterable[tuple]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """
+        Добавить много мероприятий одним executemany в одной транзакции
         
-        self.cursor.execute('''
-            INSERT INTO events (year, sport, event_type, name, location, month, 
-                              children_budget, trainers_count, trainers_budget, notes,
-                              trainers_json, last_modified, is_favorite)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
-        ''', (year, sport, event_type, name, location, month, children_budget, 
-              len(trainers_list), total_trainers_budget, notes, trainers_json,
-              datetime.now().isoformat()))
-        self.connection.commit()
-        return self.cursor.lastrowid
+        Некорректные строки пропускаются и попадают в отчёт об ошибках,
+        остальные записываются.
+        
+        Args:
+            rows: Кортежи (year, sport, event_type, name, location, month,
+                  children_budget, trainers_list, notes) - как аргументы add_event;
+                  trainers_list - список словарей с тренерами или None
+        
+        Returns:
+            Кортеж (ID добавленных мероприятий в порядке строк,
+                    ошибки [(номер строки с 0, описание), ...])
+        """
+        last_modified = datetime.now().isoformat()
+        params = []
+        errors = []
+        
+        for index, row in enumerate(rows):
+            try:
+                if len(row) != 9:
+                    raise ValueError(f"ожидается 9 полей, получено {len(row)}")
+                year, sport, event_type, name, location, month, children_budget, trainers_list, notes = row
+                for field_name, value in (("вид спорта", sport), ("тип", event_type), ("название", name),
+                                          ("место", location), ("месяц", month)):
+                    if not value:
+                        raise ValueError(f"не заполнено поле \"{field_name}\"")
+                params.append(self._event_insert_params(
+                    int(year), sport, event_type, name, location, month,
+                    float(children_budget or 0), trainers_list or [], notes or "", last_modified
+                ))
+            except (TypeError, ValueError, AttributeError) as e:
+                errors.append((index, str(e)))
+        
+        if not params:
+            return [], errors
+        
+        with self.transaction():
+            self.cursor.executemany(self._INSERT_EVENT_SQL, params)
+            # executemany не возвращает ID строк. Пока транзакция держит блокировку
+            # записи, AUTOINCREMENT выдаёт ID подряд, последний - в sqlite_sequence
+            self.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'events'")
+            last_id = self.cursor.fetchone()[0]
+            self._invalidate_years(*{event_params[0] for event_params in params})
+        
+        first_id = last_id - len(params) + 1
+        return list(range(first_id, last_id + 1)), errors
     
     def get_events_by_year(self, year: int) -> List[tuple]:
         """
         Получить все мероприятия за указанный год
         
+        При включённом кэше повторные вызовы для того же года не обращаются
+        к таблице, пока данные года не изменятся.
+        
         Returns:
             Список кортежей с данными мероприятий
         """
+        if self.event_cache_enabled:
+            self._check_event_cache()
+            rows = self._event_cache.get(year)
+            if rows is not None:
+                self.event_cache_hits += 1
+                return list(rows)
+            self.event_cache_misses += 1
+        
         self.cursor.execute('''
             SELECT id, year, sport, event_type, name, location, month, 
                    children_budget, trainers_count, trainers_budget, notes,
@@ -214,25 +628,44 @@ class Database:
                    is_favorite, last_modified, trainers_json, actual_trainers_json
             FROM events
             WHERE year = ?
-            ORDER BY 
-                CASE month
-                    WHEN 'Январь' THEN 1
-                    WHEN 'Февраль' THEN 2
-                    WHEN 'Март' THEN 3
-                    WHEN 'Апрель' THEN 4
-                    WHEN 'Май' THEN 5
-                    WHEN 'Июнь' THEN 6
-                    WHEN 'Июль' THEN 7
-                    WHEN 'Август' THEN 8
-                    WHEN 'Сентябрь' THEN 9
-                    WHEN 'Октябрь' THEN 10
-                    WHEN 'Ноябрь' THEN 11
-                    WHEN 'Декабрь' THEN 12
-                END,
-                event_type,
-                id
+            ORDER BY month_num, event_type, id
         ''', (year,))
-        return self.cursor.fetchall()
+        rows = self.cursor.fetchall()
+        if self.event_cache_enabled:
+            self._event_cache[year] = rows
+            rows = list(rows)
+        return rows
+    
+    def get_year_stats(self, year: int) -> dict:
+        """
+        Получить статистику мероприятий за год одним агрегирующим запросом
+        
+        Returns:
+            Словарь: total, completed, planned (включая мероприятия без статуса),
+            postponed, cancelled - количество мероприятий; children_budget,
+            trainers_budget - плановые суммы
+        """
+        self.cursor.execute('''
+            SELECT COUNT(*),
+                   COALESCE(SUM(status = 'Проведено'), 0),
+                   COALESCE(SUM(status = 'Запланировано' OR status IS NULL), 0),
+                   COALESCE(SUM(status = 'Перенесено'), 0),
+                   COALESCE(SUM(status = 'Отменено'), 0),
+                   COALESCE(SUM(children_budget), 0),
+                   COALESCE(SUM(trainers_budget), 0)
+            FROM events
+            WHERE year = ?
+        ''', (year,))
+        row = self.cursor.fetchone()
+        return {
+            'total': row[0],
+            'completed': row[1],
+            'planned': row[2],
+            'postponed': row[3],
+            'cancelled': row[4],
+            'children_budget': row[5],
+            'trainers_budget': row[6]
+        }
     
     def get_event_by_id(self, event_id: int) -> Optional[tuple]:
         """Получить мероприятие по ID"""
@@ -268,16 +701,19 @@ class Database:
         trainers_json = json.dumps(trainers_list, ensure_ascii=False)
         total_trainers_budget = sum(t.get('budget', 0) for t in trainers_list)
         
+        # Мероприятие могло перейти в другой год - сбрасываем оба
+        self._invalidate_event(event_id)
+        self._invalidate_years(year)
         self.cursor.execute('''
             UPDATE events
             SET year = ?, sport = ?, event_type = ?, name = ?, location = ?, 
-                month = ?, children_budget = ?, trainers_count = ?, 
+                month = ?, month_num = ?, children_budget = ?, trainers_count = ?, 
                 trainers_budget = ?, notes = ?, trainers_json = ?, last_modified = ?
             WHERE id = ?
-        ''', (year, sport, event_type, name, location, month, children_budget, 
-              len(trainers_list), total_trainers_budget, notes, trainers_json,
-              datetime.now().isoformat(), event_id))
-        self.connection.commit()
+        ''', (year, sport, event_type, name, location, month, MONTH_NUMBERS.get(month),
+              children_budget, len(trainers_list), total_trainers_budget, notes,
+              trainers_json, datetime.now().isoformat(), event_id))
+        self._commit()
     
     def update_event_clarification(self, event_id: int, status: str, 
                                    actual_start_date: str = None, actual_end_date: str = None,
@@ -291,6 +727,7 @@ class Database:
         if actual_trainers_list:
             actual_trainers_json = json.dumps(actual_trainers_list, ensure_ascii=False)
         
+        self._invalidate_event(event_id)
         self.cursor.execute('''
             UPDATE events
             SET status = ?, actual_start_date = ?, actual_end_date = ?,
@@ -301,12 +738,13 @@ class Database:
         ''', (status, actual_start_date, actual_end_date, actual_children_budget,
               actual_trainers_budget, cancellation_reason, postponement_reason,
               actual_trainers_json, datetime.now().isoformat(), event_id))
-        self.connection.commit()
+        self._commit()
     
     def delete_event(self, event_id: int):
         """Удалить мероприятие"""
+        self._invalidate_event(event_id)
         self.cursor.execute('DELETE FROM events WHERE id = ?', (event_id,))
-        self.connection.commit()
+        self._commit()
     
     def get_all_years(self) -> List[int]:
         """Получить список всех годов в БД"""
@@ -315,13 +753,33 @@ class Database:
     
     def toggle_favorite(self, event_id: int):
         """Переключить статус избранного для мероприятия"""
+        self._invalidate_event(event_id)
         self.cursor.execute('''
             UPDATE events 
             SET is_favorite = CASE WHEN is_favorite = 1 THEN 0 ELSE 1 END,
                 last_modified = ?
             WHERE id = ?
         ''', (datetime.now().isoformat(), event_id))
-        self.connection.commit()
+        self._commit()
+    
+    def update_event_budget(self, event_id: int, children_budget: float = None,
+                            trainers_budget: float = None):
+        """
+        Обновить плановый бюджет мероприятия по сметам
+        
+        Args:
+            event_id: ID мероприятия
+            children_budget: Сумма на детей (None - не менять)
+            trainers_budget: Сумма на тренеров (None - не менять)
+        """
+        self._invalidate_event(event_id)
+        if children_budget is not None:
+            self.cursor.execute('UPDATE events SET children_budget = ? WHERE id = ?',
+                                (children_budget, event_id))
+        if trainers_budget is not None:
+            self.cursor.execute('UPDATE events SET trainers_budget = ? WHERE id = ?',
+                                (trainers_budget, event_id))
+        self._commit()
     
     def get_favorite_events(self, year: int) -> List[tuple]:
         """Получить избранные мероприятия за год"""
@@ -334,23 +792,7 @@ class Database:
                    is_favorite, last_modified, trainers_json, actual_trainers_json
             FROM events
             WHERE year = ? AND is_favorite = 1
-            ORDER BY 
-                CASE month
-                    WHEN 'Январь' THEN 1
-                    WHEN 'Февраль' THEN 2
-                    WHEN 'Март' THEN 3
-                    WHEN 'Апрель' THEN 4
-                    WHEN 'Май' THEN 5
-                    WHEN 'Июнь' THEN 6
-                    WHEN 'Июль' THEN 7
-                    WHEN 'Август' THEN 8
-                    WHEN 'Сентябрь' THEN 9
-                    WHEN 'Октябрь' THEN 10
-                    WHEN 'Ноябрь' THEN 11
-                    WHEN 'Декабрь' THEN 12
-                END,
-                event_type,
-                id
+            ORDER BY month_num, event_type, id
         ''', (year,))
         return self.cursor.fetchall()
     
@@ -380,7 +822,7 @@ class Database:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
         ''', (event_id, estimate_type, trainer_name, approved_by, place, start_date,
               end_date, datetime.now().isoformat()))
-        self.connection.commit()
+        self._commit()
         return self.cursor.lastrowid
     
     def update_estimate(self, estimate_id: int, trainer_name: str = None,
@@ -392,7 +834,7 @@ class Database:
             SET trainer_name = ?, approved_by = ?, place = ?, start_date = ?, end_date = ?
             WHERE id = ?
         ''', (trainer_name, approved_by, place, start_date, end_date, estimate_id))
-        self.connection.commit()
+        self._commit()
     
     def get_estimates_by_event(self, event_id: int) -> List[tuple]:
         """Получить все сметы для мероприятия"""
@@ -418,7 +860,7 @@ class Database:
     def delete_estimate(self, estimate_id: int):
         """Удалить смету (каскадно удалятся и статьи расходов)"""
         self.cursor.execute('DELETE FROM estimates WHERE id = ?', (estimate_id,))
-        self.connection.commit()
+        self._commit()
     
     def add_estimate_item(self, estimate_id: int, category: str, description: str = "",
                          people_count: int = 0, days_count: int = 0, rate: float = 0):
@@ -441,15 +883,17 @@ class Database:
         
         self.cursor.execute('''
             INSERT INTO estimate_items (estimate_id, category, description, 
-                                       people_count, days_count, rate, total)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (estimate_id, category, description, people_count, days_count, rate, total))
-        self.connection.commit()
+                                       people_count, days_count, rate, total, category_order)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (estimate_id, category, description, people_count, days_count, rate, total,
+              CATEGORY_ORDER.get(category, OTHER_CATEGORY_ORDER)))
+        item_id = self.cursor.lastrowid
         
         # Обновляем общую сумму сметы
         self._update_estimate_total(estimate_id)
+        self._commit()
         
-        return self.cursor.lastrowid
+        return item_id
     
     def update_estimate_item(self, item_id: int, category: str, description: str = "",
                             people_count: int = 0, days_count: int = 0, rate: float = 0):
@@ -462,17 +906,18 @@ class Database:
         
         self.cursor.execute('''
             UPDATE estimate_items
-            SET category = ?, description = ?, people_count = ?, 
+            SET category = ?, category_order = ?, description = ?, people_count = ?, 
                 days_count = ?, rate = ?, total = ?
             WHERE id = ?
-        ''', (category, description, people_count, days_count, rate, total, item_id))
-        self.connection.commit()
+        ''', (category, CATEGORY_ORDER.get(category, OTHER_CATEGORY_ORDER), description,
+              people_count, days_count, rate, total, item_id))
         
         # Получаем estimate_id для обновления общей суммы
         self.cursor.execute('SELECT estimate_id FROM estimate_items WHERE id = ?', (item_id,))
         row = self.cursor.fetchone()
         if row:
             self._update_estimate_total(row[0])
+        self._commit()
     
     def get_estimate_items(self, estimate_id: int) -> List[tuple]:
         """Получить все статьи расходов сметы"""
@@ -481,17 +926,51 @@ class Database:
                    days_count, rate, total
             FROM estimate_items
             WHERE estimate_id = ?
-            ORDER BY 
-                CASE category
-                    WHEN 'Проезд' THEN 1
-                    WHEN 'Проживание' THEN 2
-                    WHEN 'Суточные' THEN 3
-                    WHEN 'Питание' THEN 4
-                    ELSE 5
-                END
+            ORDER BY category_order, id
         ''', (estimate_id,))
         return self.cursor.fetchall()
     
+    def get_year_estimates(self, year: int) -> Dict[int, Dict[str, List[tuple]]]:
+        """
+        Получить все сметы и статьи расходов за год одним запросом
+        
+        Args:
+            year: Год
+        
+        Returns:
+            Словарь {event_id: {estimate_type: [(смета, [статьи расходов]), ...]}}.
+            Сметы и статьи упорядочены так же, как в get_estimates_by_event
+            и get_estimate_items
+        """
+        self.cursor.execute('''
+            SELECT est.id, est.event_id, est.estimate_type, est.trainer_name, est.approved_by,
+                   est.place, est.start_date, est.end_date, est.created_date, est.total_amount,
+                   item.id, item.estimate_id, item.category, item.description, item.people_count,
+                   item.days_count, item.rate, item.total
+            FROM events ev
+            JOIN estimates est ON est.event_id = ev.id
+            LEFT JOIN estimate_items item ON item.estimate_id = est.id
+            WHERE ev.year = ?
+            ORDER BY est.event_id, est.estimate_type, est.trainer_name, est.id,
+                item.category_order, item.id
+        ''', (year,))
+        
+        result = {}
+        current_estimate_id = None
+        current_items = None
+        for row in self.cursor.fetchall():
+            estimate = row[:10]
+            if estimate[0] != current_estimate_id:
+                current_estimate_id = estimate[0]
+                current_items = []
+                by_type = result.setdefault(estimate[1], {})
+                by_type.setdefault(estimate[2], []).append((estimate, current_items))
+            # LEFT JOIN: у сметы без статей поля статьи равны NULL
+            if row[10] is not None:
+                current_items.append(row[10:])
+        
+        return result
+    
     def delete_estimate_item(self, item_id: int):
         """Удалить статью расходов"""
         # Сначала получаем estimate_id
@@ -499,14 +978,14 @@ class Database:
         row = self.cursor.fetchone()
         
         self.cursor.execute('DELETE FROM estimate_items WHERE id = ?', (item_id,))
-        self.connection.commit()
         
         # Обновляем общую сумму сметы
         if row:
             self._update_estimate_total(row[0])
+        self._commit()
     
     def _update_estimate_total(self, estimate_id: int):
-        """Обновить общую сумму сметы"""
+        """Обновить общую сумму сметы (commit делает вызывающий метод)"""
         self.cursor.execute('''
             UPDATE estimates
             SET total_amount = (
@@ -516,7 +995,6 @@ class Database:
             )
             WHERE id = ?
         ''', (estimate_id, estimate_id))
-        self.connection.commit()
     
     def close(self):
         """Закрыть соединение с БД"""
@@ -424,15 +424,17 @@ class EstimateGenerator:
         if event.event_type != "Выездное":
             return None, []
         
-        # Создаём смету на ППО
-        ppo_estimate_id = EstimateGenerator.generate_ppo_estimate(
-            db, event, event.children_budget
-        )
-        
-        # Создаём сметы на тренеров
-        trainer_estimate_ids = EstimateGenerator.generate_trainer_estimates(
-            db, event, event.trainers_budget, event.trainers_count
-        )
+        # Все сметы и статьи сохраняем одной транзакцией
+        with db.transaction():
+            # Создаём смету на ППО
+            ppo_estimate_id = EstimateGenerator.generate_ppo_estimate(
+                db, event, event.children_budget
+            )
+            
+            # Создаём сметы на тренеров
+            trainer_estimate_ids = EstimateGenerator.generate_trainer_estimates(
+                db, event, event.trainers_budget, event.trainers_count
+            )
         
         return ppo_estimate_id, trainer_estimate_ids
 
@@ -731,86 +731,77 @@ class EstimateEditDialog:
             messagebox.showerror("Ошибка", "Укажите ФИО тренера для сметы УЭВП")
             return
         
-        # Создаём или обновляем смету
-        if self.estimate:
-            # Обновление
-            trainer_name = self.trainer_var.get() if self.estimate_type == 'УЭВП' else None
-            self.db.update_estimate(
-                self.estimate.id,
-                trainer_name=trainer_name,
-                place=self.place_var.get(),
-                start_date=self.start_date_var.get(),
-                end_date=self.end_date_var.get()
-            )
-            estimate_id = self.estimate.id
+        # Смета, её статьи и бюджет мероприятия сохраняются одной транзакцией
+        with self.db.transaction():
+            # Создаём или обновляем смету
+            if self.estimate:
+                # Обновление
+                trainer_name = self.trainer_var.get() if self.estimate_type == 'УЭВП' else None
+                self.db.update_estimate(
+                    self.estimate.id,
+                    trainer_name=trainer_name,
+                    place=self.place_var.get(),
+                    start_date=self.start_date_var.get(),
+                    end_date=self.end_date_var.get()
+                )
+                estimate_id = self.estimate.id
+                
+                # Удаляем старые статьи
+                old_items = self.db.get_estimate_items(estimate_id)
+                for old_item in old_items:
+                    self.db.delete_estimate_item(old_item[0])
+            else:
+                # Создание
+                trainer_name = self.trainer_var.get() if self.estimate_type == 'УЭВП' else None
+                estimate_id = self.db.create_estimate(
+                    self.event.id,
+                    self.estimate_type,
+                    trainer_name=trainer_name,
+                    place=self.place_var.get(),
+                    start_date=self.start_date_var.get(),
+                    end_date=self.end_date_var.get()
+                )
             
-            # Удаляем старые статьи
-            old_items = self.db.get_estimate_items(estimate_id)
-            for old_item in old_items:
-                self.db.delete_estimate_item(old_item[0])
-        else:
-            # Создание
-            trainer_name = self.trainer_var.get() if self.estimate_type == 'УЭВП' else None
-            estimate_id = self.db.create_estimate(
-                self.event.id,
-                self.estimate_type,
-                trainer_name=trainer_name,
-                place=self.place_var.get(),
-                start_date=self.start_date_var.get(),
-                end_date=self.end_date_var.get()
-            )
-        
-        # Добавляем статьи расходов
-        total_estimate = 0.0
-        for item in self.items_tree.get_children():
-            values = self.items_tree.item(item, 'values')
-            self.db.add_estimate_item(
-                estimate_id,
-                category=values[0],
-                description=values[1],
-                people_count=int(values[2]),
-                days_count=int(values[3]),
-                rate=float(values[4])
-            )
-            # Суммируем итоговую сумму сметы
-            total_estimate += float(values[5])
-        
-        # ОБНОВЛЯЕМ БЮДЖЕТ МЕРОПРИЯТИЯ на основе сметы
-        if self.estimate_type == 'ППО':
-            # Обновляем бюджет на детей
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                UPDATE events 
-                SET children_budget = ? 
-                WHERE id = ?
-            """, (total_estimate, self.event.id))
-            self.db.connection.commit()
-        elif self.estimate_type == 'УЭВП':
-            # Для УЭВП нужно пересчитать общий бюджет на тренеров
-            # Получаем все сметы УЭВП для этого мероприятия
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                SELECT e.id FROM estimates e
-                WHERE e.event_id = ? AND e.estimate_type = 'УЭВП'
-            """, (self.event.id,))
-            uevp_estimates = cursor.fetchall()
+            # Добавляем статьи расходов
+            total_estimate = 0.0
+            for item in self.items_tree.get_children():
+                values = self.items_tree.item(item, 'values')
+                self.db.add_estimate_item(
+                    estimate_id,
+                    category=values[0],
+                    description=values[1],
+                    people_count=int(values[2]),
+                    days_count=int(values[3]),
+                    rate=float(values[4])
+                )
+                # Суммируем итоговую сумму сметы
+                total_estimate += float(values[5])
             
-            # Суммируем все сметы УЭВП
-            total_trainers_budget = 0.0
-            for est_row in uevp_estimates:
-                est_id = est_row[0]
-                items = self.db.get_estimate_items(est_id)
-                # Структура кортежа: (id, estimate_id, category, description, people_count, days_count, rate, total)
-                total_trainers_budget += sum(item[7] for item in items)  # total в индексе 7
+            # ОБНОВЛЯЕМ БЮДЖЕТ МЕРОПРИЯТИЯ на основе сметы
+            if self.estimate_type == 'ППО':
+                # Обновляем бюджет на детей
+                self.db.update_event_budget(self.event.id, children_budget=total_estimate)
+            elif self.estimate_type == 'УЭВП':
+                # Для УЭВП нужно пересчитать общий бюджет на тренеров
+                # Получаем все сметы УЭВП для этого мероприятия
+                cursor = self.db.connection.cursor()
+                cursor.execute("""
+                    SELECT e.id FROM estimates e
+                    WHERE e.event_id = ? AND e.estimate_type = 'УЭВП'
+                """, (self.event.id,))
+                uevp_estimates = cursor.fetchall()
+                
+                # Суммируем все сметы УЭВП
+                total_trainers_budget = 0.0
+                for est_row in uevp_estimates:
+                    est_id = est_row[0]
+                    items = self.db.get_estimate_items(est_id)
+                    # Структура кортежа: (id, estimate_id, category, description, people_count, days_count, rate, total)
+                    total_trainers_budget += sum(item[7] for item in items)  # total в индексе 7
+                
+                # Обновляем общий бюджет на тренеров
+                self.db.update_event_budget(self.event.id, trainers_budget=total_trainers_budget)
             
-            # Обновляем общий бюджет на тренеров
-            cursor.execute("""
-                UPDATE events 
-                SET trainers_budget = ? 
-                WHERE id = ?
-            """, (total_trainers_budget, self.event.id))
-            self.db.connection.commit()
-        
         self.result = True
         self.window.destroy()
 
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Индекс мероприятий года для фильтров
+
+Для каждого признака (статус, тип, вид спорта, месяц, избранное) хранит
+множества id мероприятий по значениям. Комбинация фильтров - пересечение
+множеств, количество по каждому значению известно без перебора.
+Индекс синхронизируется со строками БД: заново разбираются только
+изменившиеся мероприятия.
+
+Порядки сортировки по колонкам вычисляются один раз для версии набора
+и хранятся как перестановки id.
+"""
+
+from typing import Callable, Dict, Iterable, List, Set
+from models import Event
+
+
+# Признаки, по которым строится индекс
+FACETS = ('status', 'event_type', 'sport', 'month', 'favorite')
+
+
+def facet_value(event: Event, facet: str):
+    """
+    Значение признака мероприятия
+    
+    Мероприятие без статуса считается запланированным, избранное - bool.
+    """
+    if facet == 'status':
+        return event.status or "Запланировано"
+    if facet == 'favorite':
+        return bool(event.is_favorite)
+    return getattr(event, facet)
+
+
+class EventIndex:
+    """Мероприятия года с множествами id по значениям признаков"""
+    
+    def __init__(self, year: int):
+        """
+        Создать пустой индекс
+        
+        Args:
+            year: Год мероприятий
+        """
+        self.year = year
+        self.events: Dict[int, Event] = {}
+        self._rows: Dict[int, tuple] = {}  # id -> строка БД, по которой построено Event
+        self._position: Dict[int, int] = {}  # id -> позиция в порядке БД
+        self.facets: Dict[str, Dict[object, Set[int]]] = {facet: {} for facet in FACETS}
+        
+        # Перестановки сортировки: (имя, по убыванию) -> id в порядке сортировки.
+        # Сбрасываются при любом изменении набора
+        self._sort_orders: Dict[tuple, List[int]] = {}
+        self._sort_keys: Dict[str, list] = {}  # имя -> ключи в порядке перестановки
+    
+    def sync(self, rows: Iterable[tuple]) -> int:
+        """
+        Привести индекс к строкам get_events_by_year
+        
+        Новые и изменившиеся строки разбираются в Event и переиндексируются,
+        отсутствующие удаляются.
+        
+        Returns:
+            Количество добавленных, изменённых и удалённых мероприятий
+        """
+        changed = 0
+        position = {}
+        for index, row in enumerate(rows):
+            event_id = row[0]
+            position[event_id] = index
+            if self._rows.get(event_id) != row:
+                self._remove(event_id)
+                self._add(Event.from_db_row(row), row)
+                changed += 1
+        
+        for event_id in [event_id for event_id in self.events if event_id not in position]:
+            self._remove(event_id)
+            changed += 1
+        
+        if changed:
+            self._sort_orders.clear()
+            self._sort_keys.clear()
+        self._position = position
+        return changed
+    
+    def _add(self, event: Event, row: tuple):
+        """Добавить мероприятие во все множества признаков"""
+        self.events[event.id] = event
+        self._rows[event.id] = row
+        for facet, values in self.facets.items():
+            values.setdefault(facet_value(event, facet), set()).add(event.id)
+    
+    def _remove(self, event_id: int):
+        """Убрать мероприятие из всех множеств признаков"""
+        event = self.events.pop(event_id, None)
+        if event is None:
+            return
+        del self._rows[event_id]
+        for facet, values in self.facets.items():
+            value = facet_value(event, facet)
+            ids = values[value]
+            ids.discard(event_id)
+            if not ids:
+                del values[value]
+    
+    def counts(self, facet: str) -> Dict[object, int]:
+        """Количество мероприятий по значениям признака"""
+        return {value: len(ids) for value, ids in self.facets[facet].items()}
+    
+    def count(self, facet: str, value) -> int:
+        """Количество мероприятий с данным значением признака"""
+        return len(self.facets[facet].get(value, ()))
+    
+    def select(self, criteria: Dict[str, object]) -> List[Event]:
+        """
+        Мероприятия, подходящие под все условия
+        
+        Args:
+            criteria: Словарь {признак: значение}; пустой - все мероприятия
+        
+        Returns:
+            Мероприятия в порядке строк БД
+        """
+        if not criteria:
+            return [self.events[event_id] for event_id in self._position]
+        
+        # Пересекаем начиная с самого маленького множества
+        sets = sorted((self.facets[facet].get(value, set()) for facet, value in criteria.items()),
+                      key=len)
+        ids = sets[0].intersection(*sets[1:])
+        return [self.events[event_id] for event_id in sorted(ids, key=self._position.__getitem__)]
+    
+    def sort_order(self, name: str, key: Callable[[Event], object], reverse: bool = False) -> List[int]:
+        """
+        Порядок всех мероприятий набора при сортировке по ключу
+        
+        Сортировка выполняется один раз для версии набора; порядок по убыванию
+        получается из порядка по возрастанию без повторной сортировки.
+        Как и sorted(), сохраняет исходный порядок (порядок БД) равных элементов
+        в обоих направлениях.
+        
+        Args:
+            name: Имя сортировки (например, колонка таблицы) - ключ кэша
+            key: Функция ключа сортировки
+            reverse: По убыванию
+        
+        Returns:
+            Список id мероприятий
+        """
+        cache_key = (name, reverse)
+        order = self._sort_orders.get(cache_key)
+        if order is not None:
+            return order
+        
+        ascending = self._sort_orders.get((name, False))
+        if ascending is None:
+            pairs = sorted(((key(self.events[event_id]), event_id) for event_id in self._position),
+                           key=lambda pair: pair[0])
+            ascending = [event_id for _, event_id in pairs]
+            self._sort_orders[(name, False)] = ascending
+            self._sort_keys[name] = [sort_key for sort_key, _ in pairs]
+        
+        if reverse:
+            order = self._reverse_groups(ascending, self._sort_keys[name])
+            self._sort_orders[cache_key] = order
+            return order
+        return ascending
+    
+    @staticmethod
+    def _reverse_groups(order: List[int], keys: list) -> List[int]:
+        """Обратный порядок групп равных ключей; внутри группы порядок сохраняется"""
+        result = []
+        end = len(order)
+        while end > 0:
+            start = end - 1
+            while start > 0 and keys[start - 1] == keys[end - 1]:
+                start -= 1
+            result.extend(order[start:end])
+            end = start
+        return result
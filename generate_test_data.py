@@ -3,9 +3,10 @@
 Скрипт для генерации тестовых данных на 2025 год
 """
 
+import json
 import random
 from datetime import datetime, timedelta
-from database import Database
+from database import Database, MONTH_NUMBERS
 from constants import SPORTS, MONTHS
 
 def generate_test_data():
@@ -15,8 +16,8 @@ def generate_test_data():
     
     # Очищаем старые данные 2025 года (если есть)
     print("Очистка старых данных 2025 года...")
-    db.cursor.execute("DELETE FROM events WHERE year = 2025")
-    db.connection.commit()
+    with db.transaction():
+        db.cursor.execute("DELETE FROM events WHERE year = 2025")
     
     # Параметры генерации
     total_events = random.randint(80, 120)
@@ -206,105 +207,112 @@ def generate_test_data():
         'Сентябрь': 9, 'Октябрь': 10, 'Ноябрь': 11, 'Декабрь': 12
     }
     
-    for idx, event in enumerate(events_data):
-        # Базовые данные
-        year = 2025
-        sport = event['sport']
-        event_type = event['event_type']
-        name = event['name']
-        location = event['location']
-        month = event['month']
-        children_budget = event['children_budget']
-        trainers_budget = event['trainers_budget']
-        trainers_count = event['trainers_count']
-        notes = ""
-        
-        # Статус и фактические данные
-        if idx in conducted_indices:
-            status = "Проведено"
-            
-            # Генерируем даты
-            month_num = month_numbers[month]
-            day_start = random.randint(1, 25)
-            duration = random.randint(1, 3)  # 1-3 дня
+    # Все мероприятия - одной транзакцией (учитывается в счётчике записей БД)
+    with db.transaction():
+        for idx, event in enumerate(events_data):
+            # Базовые данные
+            year = 2025
+            sport = event['sport']
+            event_type = event['event_type']
+            name = event['name']
+            location = event['location']
+            month = event['month']
+            children_budget = event['children_budget']
+            trainers_budget = event['trainers_budget']
+            trainers_count = event['trainers_count']
+            notes = ""
             
-            try:
-                start_date = datetime(2025, month_num, day_start)
-                end_date = start_date + timedelta(days=duration)
-                actual_start_date = start_date.strftime('%d.%m.%Y')
-                actual_end_date = end_date.strftime('%d.%m.%Y')
-            except:
-                # На случай невалидной даты
-                actual_start_date = f"15.{month_num:02d}.2025"
-                actual_end_date = f"17.{month_num:02d}.2025"
+            # Статус и фактические данные
+            if idx in conducted_indices:
+                status = "Проведено"
+                
+                # Генерируем даты
+                month_num = month_numbers[month]
+                day_start = random.randint(1, 25)
+                duration = random.randint(1, 3)  # 1-3 дня
+                
+                try:
+                    start_date = datetime(2025, month_num, day_start)
+                    end_date = start_date + timedelta(days=duration)
+                    actual_start_date = start_date.strftime('%d.%m.%Y')
+                    actual_end_date = end_date.strftime('%d.%m.%Y')
+                except:
+                    # На случай невалидной даты
+                    actual_start_date = f"15.{month_num:02d}.2025"
+                    actual_end_date = f"17.{month_num:02d}.2025"
+                
+                # Фактические расходы с отклонением ±20%
+                if children_budget > 0:
+                    deviation = random.uniform(-0.2, 0.2)
+                    actual_children_budget = children_budget * (1 + deviation)
+                    actual_children_budget = round(actual_children_budget, 2)
+                else:
+                    actual_children_budget = None
+                
+                if trainers_budget > 0:
+                    deviation = random.uniform(-0.2, 0.2)
+                    actual_trainers_budget = trainers_budget * (1 + deviation)
+                    actual_trainers_budget = round(actual_trainers_budget, 2)
+                else:
+                    actual_trainers_budget = None
+                
+                cancellation_reason = None
+                postponement_reason = None
             
-            # Фактические расходы с отклонением ±20%
-            if children_budget > 0:
-                deviation = random.uniform(-0.2, 0.2)
-                actual_children_budget = children_budget * (1 + deviation)
-                actual_children_budget = round(actual_children_budget, 2)
-            else:
+            elif idx in cancelled_indices:
+                # Отменено (5%)
+                status = "Отменено"
+                actual_start_date = None
+                actual_end_date = None
                 actual_children_budget = None
+                actual_trainers_budget = None
+                
+                # Причины отмены
+                cancellation_reasons = [
+                    "Отсутствие финансирования",
+                    "Недостаточное количество участников",
+                    "Болезнь тренера",
+                    "Неблагоприятные погодные условия",
+                    "Отказ принимающей стороны",
+                    "Карантинные мероприятия",
+                    "Технические причины (неисправность оборудования)"
+                ]
+                cancellation_reason = random.choice(cancellation_reasons)
+                postponement_reason = None
             
-            if trainers_budget > 0:
-                deviation = random.uniform(-0.2, 0.2)
-                actual_trainers_budget = trainers_budget * (1 + deviation)
-                actual_trainers_budget = round(actual_trainers_budget, 2)
             else:
+                # Запланировано (15%)
+                status = "Запланировано"
+                actual_start_date = None
+                actual_end_date = None
+                actual_children_budget = None
                 actual_trainers_budget = None
+                cancellation_reason = None
+                postponement_reason = None
             
-            cancellation_reason = None
-            postponement_reason = None
+            # Тренеры с равной долей суммы (как при миграции старых записей)
+            budget_per_trainer = trainers_budget / trainers_count if trainers_count else 0
+            trainers = [{"name": f"Тренер {i+1}", "budget": budget_per_trainer}
+                        for i in range(trainers_count)]
             
-        elif idx in cancelled_indices:
-            # Отменено (5%)
-            status = "Отменено"
-            actual_start_date = None
-            actual_end_date = None
-            actual_children_budget = None
-            actual_trainers_budget = None
-            
-            # Причины отмены
-            cancellation_reasons = [
-                "Отсутствие финансирования",
-                "Недостаточное количество участников",
-                "Болезнь тренера",
-                "Неблагоприятные погодные условия",
-                "Отказ принимающей стороны",
-                "Карантинные мероприятия",
-                "Технические причины (неисправность оборудования)"
-            ]
-            cancellation_reason = random.choice(cancellation_reasons)
-            postponement_reason = None
-            
-        else:
-            # Запланировано (15%)
-            status = "Запланировано"
-            actual_start_date = None
-            actual_end_date = None
-            actual_children_budget = None
-            actual_trainers_budget = None
-            cancellation_reason = None
-            postponement_reason = None
-        
-        # Вставка в БД
-        db.cursor.execute('''
-            INSERT INTO events (
+            # Вставка в БД
+            db.cursor.execute('''
+                INSERT INTO events (
+                    year, sport, event_type, name, location, month,
+                    children_budget, trainers_count, trainers_budget, notes,
+                    status, actual_start_date, actual_end_date,
+                    actual_children_budget, actual_trainers_budget,
+                    cancellation_reason, postponement_reason, month_num,
+                    trainers_json, last_modified
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
                 year, sport, event_type, name, location, month,
                 children_budget, trainers_count, trainers_budget, notes,
                 status, actual_start_date, actual_end_date,
                 actual_children_budget, actual_trainers_budget,
-                cancellation_reason, postponement_reason
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            year, sport, event_type, name, location, month,
-            children_budget, trainers_count, trainers_budget, notes,
-            status, actual_start_date, actual_end_date,
-            actual_children_budget, actual_trainers_budget,
-            cancellation_reason, postponement_reason
-        ))
-    
-    db.connection.commit()
+                cancellation_reason, postponement_reason, MONTH_NUMBERS.get(month),
+                json.dumps(trainers, ensure_ascii=False), datetime.now().isoformat()
+            ))
     
     planned_count = len(events_data) - conducted_count - cancelled_count
     
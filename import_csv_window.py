@@ -5,14 +5,19 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
-from constants import SPORTS, MONTHS, EVENT_TYPES
+from csv_source import CSVSource
+from constants import SPORTS, EVENT_TYPES
+from import_normalizer import ImportNormalizer
 from models import Event
+from import_worker import ImportWorker
 
 
 class ImportCSVWindow:
     """Класс окна для импорта мероприятий из CSV"""
     
+    # Количество строк в предпросмотре
+    PREVIEW_ROWS = 100
+    
     def __init__(self, parent, db, year: int, callback=None):
         """
         Инициализация окна
@@ -28,10 +33,13 @@ class ImportCSVWindow:
         self.year = year
         self.callback = callback
         
-        self.csv_data = []  # Данные из CSV
+        self.csv_source = None  # Выбранный CSV файл (CSVSource)
+        self.csv_preview = []  # Первые строки файла для предпросмотра
         self.csv_headers = []  # Заголовки из CSV
         self.column_mapping = {}  # Сопоставление колонок
         self.selected_sport = None  # Выбранный вид спорта для всего файла
+        self.normalizer = None  # Таблицы нормализации значений (ImportNormalizer)
+        self.import_worker = None  # Фоновый поток импорта (ImportWorker)
         
         # Создаем окно
         self.window = tk.Toplevel(parent)
@@ -55,7 +63,7 @@ class ImportCSVWindow:
                 self.window.geometry("900x750")
         
         # Обработчик закрытия окна (для Red OS и других систем)
-        self.window.protocol("WM_DELETE_WINDOW", self.window.destroy)
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
         
         self._create_widgets()
     
@@ -176,9 +184,19 @@ class ImportCSVWindow:
         # Изначально скрываем
         self.preview_frame.pack_forget()
         
+        # Ход импорта (показывается во время импорта)
+        self.progress_frame = ttk.Frame(main_frame)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode='determinate')
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.progress_label = ttk.Label(self.progress_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(self.progress_frame, text="Отмена", command=self._cancel_import)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
         # Нижняя панель с кнопками
         bottom_frame = ttk.Frame(main_frame)
         bottom_frame.pack(fill=tk.X, pady=(10, 0))
+        self.bottom_frame = bottom_frame
         
         self.preview_button = ttk.Button(
             bottom_frame, text="Предпросмотр", command=self._preview_data, state='disabled'
@@ -190,7 +208,7 @@ class ImportCSVWindow:
         )
         self.import_button.pack(side=tk.LEFT, padx=5)
         
-        ttk.Button(bottom_frame, text="Закрыть", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(bottom_frame, text="Закрыть", command=self._close).pack(side=tk.RIGHT, padx=5)
     
     def _select_file(self):
         """Выбрать CSV файл"""
@@ -207,13 +225,18 @@ class ImportCSVWindow:
             return
         
         try:
-            # Пробуем разные кодировки и разделители
-            self.csv_data, self.csv_headers = self._read_csv_file(file_path)
+            # Определяем формат по началу файла; сами строки читаются потоком
+            csv_source = CSVSource(file_path)
+            csv_preview = csv_source.head(self.PREVIEW_ROWS)
             
-            if not self.csv_data:
+            if not csv_preview:
                 messagebox.showerror("Ошибка", "CSV файл пуст или не удалось прочитать данные")
                 return
             
+            self.csv_source = csv_source
+            self.csv_preview = csv_preview
+            self.csv_headers = csv_source.headers
+            
             # Обновляем интерфейс
             self.file_label.config(text=file_path.split('/')[-1], foreground="black")
             
@@ -234,45 +257,14 @@ class ImportCSVWindow:
             
             messagebox.showinfo(
                 "Успешно", 
-                f"Загружено {len(self.csv_data)} строк с {len(self.csv_headers)} колонками"
+                f"Файл прочитан: {len(self.csv_headers)} колонок, "
+                f"около {csv_source.estimate_rows()} строк\n"
+                f"Кодировка: {csv_source.encoding}, разделитель: {csv_source.delimiter!r}"
             )
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось прочитать файл:\n{str(e)}")
     
-    def _read_csv_file(self, file_path):
-        """Прочитать CSV файл с автоопределением кодировки и разделителя"""
-        encodings = ['utf-8-sig', 'utf-8', 'cp1251', 'windows-1251', 'latin-1']
-        delimiters = [';', ',', '\t', '|']
-        
-        for encoding in encodings:
-            for delimiter in delimiters:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        # Читаем первую строку для проверки
-                        sample = f.read(1024)
-                        f.seek(0)
-                        
-                        # Проверяем, подходит ли разделитель
-                        if delimiter not in sample:
-                            continue
-                        
-                        reader = csv.DictReader(f, delimiter=delimiter)
-                        headers = reader.fieldnames
-                        
-                        if not headers:
-                            continue
-                        
-                        data = list(reader)
-                        
-                        if data:
-                            return data, headers
-                            
-                except Exception:
-                    continue
-        
-        raise Exception("Не удалось определить формат файла. Попробуйте другой файл.")
-    
     def _auto_map_columns(self):
         """Автоматическое сопоставление колонок по похожим названиям"""
         # Словарь похожих названий
@@ -348,10 +340,13 @@ class ImportCSVWindow:
             self.preview_tree.heading(col, text=col)
             self.preview_tree.column(col, width=100)
         
+        # Таблицы нормализации строятся один раз и используются и импортом
+        self.normalizer = ImportNormalizer()
+        
         # Заполняем данные с валидацией
         valid_count = 0
         
-        for i, row in enumerate(self.csv_data[:100], 1):  # Показываем первые 100
+        for i, row in enumerate(self.csv_preview, 1):
             values = {'#': i}
             status = "✓ OK"
             
@@ -380,10 +375,11 @@ class ImportCSVWindow:
         # Показываем фрейм предпросмотра
         self.preview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
-        # Обновляем статус
-        total = len(self.csv_data)
+        # Обновляем статус (весь файл не читается - количество строк оценочное)
+        shown = len(self.csv_preview)
+        total = max(self.csv_source.estimate_rows(), shown)
         self.preview_status.config(
-            text=f"Готово к импорту: {valid_count} из {total} записей"
+            text=f"Валидных в первых {shown} записях: {valid_count} (всего около {total})"
         )
         
         # Активируем кнопку импорта
@@ -392,99 +388,10 @@ class ImportCSVWindow:
         
         messagebox.showinfo(
             "Предпросмотр", 
-            f"Валидных записей: {valid_count} из {total}\n" +
-            (f"Показаны первые 100 записей" if total > 100 else "")
+            f"Валидных записей: {valid_count} из {shown}\n" +
+            (f"Показаны первые {shown} записей из примерно {total}" if total > shown else "")
         )
     
-    def _normalize_sport(self, sport_value):
-        """Нормализация вида спорта - подбор из констант"""
-        if not sport_value:
-            return None
-        
-        sport_lower = sport_value.lower().strip()
-        
-        # Точное совпадение
-        for sport in SPORTS:
-            if sport.lower() == sport_lower:
-                return sport
-        
-        # Частичное совпадение (содержит)
-        for sport in SPORTS:
-            if sport_lower in sport.lower() or sport.lower() in sport_lower:
-                return sport
-        
-        # Словарь альтернативных названий
-        sport_aliases = {
-            'Бокс': ['бокс', 'boxing'],
-            'Волейбол': ['волейбол', 'волейболл', 'volleyball', 'вб'],
-            'Киокусинкай': ['киокусинкай', 'киокушинкай', 'каратэ', 'карате', 'kyokushin'],
-            'Лыжные гонки': ['лыжи', 'лыжные', 'лыжн', 'ski', 'skiing'],
-            'Настольный тенис': ['настольный теннис', 'настольный тенис', 'тенис', 'теннис', 'нт', 'table tennis', 'пинг-понг'],
-            'Плавание': ['плавание', 'плаванье', 'бассейн', 'swimming'],
-            'Танцевальный спорт': ['танцы', 'танцевальный', 'танец', 'dance', 'dancing'],
-            'Футзал': ['футзал', 'футбол', 'мини-футбол', 'мини футбол', 'футсал', 'futsal', 'football']
-        }
-        
-        for sport, aliases in sport_aliases.items():
-            for alias in aliases:
-                if alias in sport_lower or sport_lower in alias:
-                    return sport
-        
-        return None
-    
-    def _normalize_event_type(self, type_value):
-        """Нормализация типа мероприятия"""
-        if not type_value:
-            return None
-        
-        type_lower = type_value.lower().strip()
-        
-        # Проверяем ключевые слова
-        if any(word in type_lower for word in ['внутр', 'внутренн']):
-            return 'Внутреннее'
-        if any(word in type_lower for word in ['выезд', 'выездн']):
-            return 'Выездное'
-        
-        return None
-    
-    def _normalize_month(self, month_value):
-        """Нормализация месяца"""
-        if not month_value:
-            return None
-        
-        month_lower = month_value.lower().strip()
-        
-        # Точное совпадение
-        for month in MONTHS:
-            if month.lower() == month_lower:
-                return month
-        
-        # Частичное совпадение
-        for month in MONTHS:
-            if month_lower in month.lower() or month.lower() in month_lower:
-                return month
-        
-        # Английские названия
-        month_translations = {
-            'january': 'Январь', 'jan': 'Январь',
-            'february': 'Февраль', 'feb': 'Февраль',
-            'march': 'Март', 'mar': 'Март',
-            'april': 'Апрель', 'apr': 'Апрель',
-            'may': 'Май',
-            'june': 'Июнь', 'jun': 'Июнь',
-            'july': 'Июль', 'jul': 'Июль',
-            'august': 'Август', 'aug': 'Август',
-            'september': 'Сентябрь', 'sep': 'Сентябрь', 'sept': 'Сентябрь',
-            'october': 'Октябрь', 'oct': 'Октябрь',
-            'november': 'Ноябрь', 'nov': 'Ноябрь',
-            'december': 'Декабрь', 'dec': 'Декабрь'
-        }
-        
-        if month_lower in month_translations:
-            return month_translations[month_lower]
-        
-        return None
-    
     def _validate_row(self, values):
         """Валидация одной строки данных"""
         errors = []
@@ -503,7 +410,7 @@ class ImportCSVWindow:
         
         # Проверка вида спорта (с нормализацией)
         if values.get('sport'):
-            normalized_sport = self._normalize_sport(values['sport'])
+            normalized_sport = self.normalizer.sport(values['sport'])
             if not normalized_sport:
                 errors.append(f"Неизвестный вид спорта: {values['sport']}")
             else:
@@ -511,7 +418,7 @@ class ImportCSVWindow:
         
         # Проверка типа (с нормализацией)
         if values.get('event_type'):
-            normalized_type = self._normalize_event_type(values['event_type'])
+            normalized_type = self.normalizer.event_type(values['event_type'])
             if not normalized_type:
                 errors.append(f"Неизвестный тип: {values['event_type']}")
             else:
@@ -519,7 +426,7 @@ class ImportCSVWindow:
         
         # Проверка месяца (с нормализацией)
         if values.get('month'):
-            normalized_month = self._normalize_month(values['month'])
+            normalized_month = self.normalizer.month(values['month'])
             if not normalized_month:
                 errors.append(f"Неизвестный месяц: {values['month']}")
             else:
@@ -547,8 +454,44 @@ class ImportCSVWindow:
         
         return errors
     
+    def _prepare_row(self, row):
+        """
+        Подготовить строку CSV к записи в БД
+        
+        Вызывается из потока импорта, поэтому не обращается к виджетам.
+        
+        Returns:
+            Кортеж (кортеж для Database.add_events_bulk или None, список ошибок)
+        """
+        # Собираем данные
+        values = {}
+        for field_key, csv_column in self.column_mapping.items():
+            values[field_key] = (row.get(csv_column) or '').strip()
+        
+        # Если вид спорта не в CSV, используем выбранный
+        if 'sport' not in values or not values.get('sport'):
+            values['sport'] = self.selected_sport
+        
+        # Валидация (заодно нормализует вид спорта, тип и месяц)
+        errors = self._validate_row(values)
+        if errors:
+            return None, errors
+        
+        # Необязательные поля с значениями по умолчанию
+        children_budget = float(values['children_budget']) if values.get('children_budget') else 0.0
+        trainers_count = int(values['trainers_count']) if values.get('trainers_count') else 1
+        trainers_budget = float(values['trainers_budget']) if values.get('trainers_budget') else 0.0
+        
+        event_row = (
+            self.year, values['sport'], values['event_type'], values['name'],
+            values['location'], values['month'], children_budget,
+            self.db.make_trainers_list(trainers_count, trainers_budget),
+            values.get('notes', '')
+        )
+        return event_row, []
+    
     def _import_data(self):
-        """Импортировать данные в базу"""
+        """Запустить импорт данных в базу в фоновом потоке"""
         if not messagebox.askyesno(
             "Подтверждение", 
             f"Импортировать мероприятия в {self.year} год?\n\n" +
@@ -556,61 +499,113 @@ class ImportCSVWindow:
         ):
             return
         
-        imported_count = 0
-        error_count = 0
+        # Файл читается заново потоком уже в фоновом потоке
+        self.import_worker = ImportWorker(
+            self.db.db_name, self.db.profile, self.csv_source.rows(), self._prepare_row,
+            total=self.csv_source.estimate_rows()
+        )
         
-        for row in self.csv_data:
-            # Собираем данные
-            values = {}
-            for field_key, csv_column in self.column_mapping.items():
-                values[field_key] = row.get(csv_column, '').strip()
-            
-            # Если вид спорта не в CSV, используем выбранный
-            if 'sport' not in values or not values.get('sport'):
-                values['sport'] = self.selected_sport
-            
-            # Валидация
-            errors = self._validate_row(values)
-            if errors:
-                error_count += 1
-                continue
-            
-            try:
-                # Нормализация обязательных полей
-                sport = self._normalize_sport(values.get('sport', '')) or ''
-                event_type = self._normalize_event_type(values.get('event_type', '')) or ''
-                month = self._normalize_month(values.get('month', '')) or ''
-                name = values.get('name', '').strip()
-                location = values.get('location', '').strip()
-                
-                # Необязательные поля с значениями по умолчанию
-                children_budget = float(values.get('children_budget', 0)) if values.get('children_budget') else 0.0
-                trainers_count = int(values.get('trainers_count', 1)) if values.get('trainers_count') else 1
-                trainers_budget = float(values.get('trainers_budget', 0)) if values.get('trainers_budget') else 0.0
-                notes = values.get('notes', '').strip()
-                
-                # Добавляем в БД
-                self.db.add_event(
-                    self.year, sport, event_type, name, location, month,
-                    children_budget, trainers_count, trainers_budget, notes
+        # Блокируем кнопки на время импорта и показываем ход работы
+        self.preview_button.config(state='disabled')
+        self.import_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.progress_bar.config(maximum=max(self.import_worker.total, 1), value=0)
+        self.progress_label.config(text="Импорт...")
+        self.progress_frame.pack(fill=tk.X, pady=(10, 0), before=self.bottom_frame)
+        
+        self.import_worker.start()
+        self.window.after(100, self._poll_import)
+    
+    def _poll_import(self):
+        """Обработать сообщения потока импорта (вызывается через after())"""
+        worker = self.import_worker
+        if worker is None or not self.window.winfo_exists():
+            return
+        
+        while not worker.messages.empty():
+            message = worker.messages.get_nowait()
+            if message[0] == 'progress':
+                _, processed, imported, error_count = message
+                # Общее количество строк оценочное - шкала растёт при необходимости
+                if processed > int(self.progress_bar.cget('maximum')):
+                    self.progress_bar.config(maximum=processed)
+                self.progress_bar.config(value=processed)
+                self.progress_label.config(
+                    text=f"Обработано: {processed} из ~{max(worker.total, processed)}, "
+                         f"импортировано: {imported}, ошибок: {error_count}"
                 )
-                imported_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                print(f"Ошибка импорта строки: {e}")
+            elif message[0] == 'done':
+                self._finish_import(message[1])
+                return
+            elif message[0] == 'error':
+                self._fail_import(message[1], message[2])
+                return
+        
+        self.window.after(100, self._poll_import)
+    
+    def _finish_import(self, result):
+        """Показать итог импорта и закрыть окно"""
+        self.import_worker = None
+        errors = result['errors']
         
         # Результат
-        messagebox.showinfo(
-            "Импорт завершен",
-            f"Успешно импортировано: {imported_count}\n" +
-            f"Ошибок: {error_count}"
-        )
+        title = "Импорт отменён" if result['cancelled'] else "Импорт завершен"
+        result_text = f"Успешно импортировано: {result['imported']}\n" + f"Ошибок: {len(errors)}"
+        if result['cancelled']:
+            result_text += f"\nОбработано строк до отмены: {result['processed']}"
+        result_text += (f"\n\nВремя: {result['elapsed']:.1f} с "
+                        f"({result['rows_per_second']:.0f} строк/с)")
+        if errors:
+            result_text += "\n\n" + "\n".join(f"Строка {row_number}: {message}" for row_number, message in errors[:10])
+            if len(errors) > 10:
+                result_text += f"\n... и ещё {len(errors) - 10}"
+        messagebox.showinfo(title, result_text)
         
         # Вызываем callback если есть
-        if self.callback:
+        if self.callback and result['imported']:
             self.callback()
         
         # Закрываем окно
         self.window.destroy()
-
+    
+    def _fail_import(self, error: str, imported: int):
+        """
+        Показать ошибку импорта; окно остаётся открытым для повтора
+        
+        Args:
+            error: Текст ошибки
+            imported: Мероприятий, записанных до ошибки (порции уже зафиксированы)
+        """
+        self.import_worker = None
+        self.progress_frame.pack_forget()
+        self.preview_button.config(state='normal')
+        self.import_button.config(state='normal')
+        
+        # Записанные порции уже в БД - главное окно должно их показать
+        if self.callback and imported:
+            self.callback()
+        
+        message = f"Не удалось импортировать данные:\n{error}"
+        if imported:
+            message += f"\n\nДо ошибки сохранено мероприятий: {imported}"
+        messagebox.showerror("Ошибка", message)
+    
+    def _cancel_import(self):
+        """Отменить идущий импорт"""
+        if self.import_worker:
+            self.import_worker.cancel()
+            self.cancel_button.config(state='disabled')
+            self.progress_label.config(text="Отмена...")
+    
+    def _close(self):
+        """Закрыть окно (идущий импорт отменяется)"""
+        worker = self.import_worker
+        if worker:
+            self.import_worker = None
+            worker.cancel()
+            # Текущая порция откатывается; ждём поток, чтобы обновить
+            # главное окно уже после фиксации записанных порций
+            worker.join(timeout=5)
+            if self.callback and worker.imported:
+                self.callback()
+        self.window.destroy()
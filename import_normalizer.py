@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Нормализация значений при импорте из CSV
+
+Вид спорта, тип мероприятия и месяц приводятся к значениям из констант.
+Таблица точных совпадений строится один раз на импорт, неточные значения
+подбираются по вхождению подстроки, а результат запоминается для каждого
+исходного значения - каждое различное значение в файле разбирается один раз.
+"""
+
+from typing import Dict, Optional
+from constants import SPORTS, MONTHS
+
+
+# Альтернативные названия видов спорта
+SPORT_ALIASES = {
+    'Бокс': ['бокс', 'boxing'],
+    'Волейбол': ['волейбол', 'волейболл', 'volleyball', 'вб'],
+    'Киокусинкай': ['киокусинкай', 'киокушинкай', 'каратэ', 'карате', 'kyokushin'],
+    'Лыжные гонки': ['лыжи', 'лыжные', 'лыжн', 'ski', 'skiing'],
+    'Настольный тенис': ['настольный теннис', 'настольный тенис', 'тенис', 'теннис', 'нт', 'table tennis', 'пинг-понг'],
+    'Плавание': ['плавание', 'плаванье', 'бассейн', 'swimming'],
+    'Танцевальный спорт': ['танцы', 'танцевальный', 'танец', 'dance', 'dancing'],
+    'Футзал': ['футзал', 'футбол', 'мини-футбол', 'мини футбол', 'футсал', 'futsal', 'football']
+}
+
+# Английские названия месяцев
+MONTH_TRANSLATIONS = {
+    'january': 'Январь', 'jan': 'Январь',
+    'february': 'Февраль', 'feb': 'Февраль',
+    'march': 'Март', 'mar': 'Март',
+    'april': 'Апрель', 'apr': 'Апрель',
+    'may': 'Май',
+    'june': 'Июнь', 'jun': 'Июнь',
+    'july': 'Июль', 'jul': 'Июль',
+    'august': 'Август', 'aug': 'Август',
+    'september': 'Сентябрь', 'sep': 'Сентябрь', 'sept': 'Сентябрь',
+    'october': 'Октябрь', 'oct': 'Октябрь',
+    'november': 'Ноябрь', 'nov': 'Ноябрь',
+    'december': 'Декабрь', 'dec': 'Декабрь'
+}
+
+# Ключевые слова типов мероприятий
+EVENT_TYPE_KEYWORDS = [
+    ('внутр', 'Внутреннее'),
+    ('выезд', 'Выездное'),
+]
+
+
+def match_sport(sport_lower: str) -> Optional[str]:
+    """
+    Подобрать вид спорта по вхождению подстроки
+    
+    Args:
+        sport_lower: Значение в нижнем регистре без пробелов по краям
+    
+    Returns:
+        Вид спорта из констант или None
+    """
+    for sport in SPORTS:
+        if sport.lower() == sport_lower:
+            return sport
+    
+    # Частичное совпадение (содержит)
+    for sport in SPORTS:
+        if sport_lower in sport.lower() or sport.lower() in sport_lower:
+            return sport
+    
+    for sport, aliases in SPORT_ALIASES.items():
+        for alias in aliases:
+            if alias in sport_lower or sport_lower in alias:
+                return sport
+    
+    return None
+
+
+def match_event_type(type_lower: str) -> Optional[str]:
+    """Подобрать тип мероприятия по ключевому слову"""
+    for keyword, event_type in EVENT_TYPE_KEYWORDS:
+        if keyword in type_lower:
+            return event_type
+    return None
+
+
+def match_month(month_lower: str) -> Optional[str]:
+    """Подобрать месяц по вхождению подстроки или английскому названию"""
+    for month in MONTHS:
+        if month.lower() == month_lower:
+            return month
+    
+    # Частичное совпадение
+    for month in MONTHS:
+        if month_lower in month.lower() or month.lower() in month_lower:
+            return month
+    
+    return MONTH_TRANSLATIONS.get(month_lower)
+
+
+class ImportNormalizer:
+    """Таблицы нормализации на один импорт"""
+    
+    def __init__(self):
+        """Построить таблицы точных совпадений"""
+        # Ключи - известные написания в нижнем регистре. Значения получены
+        # теми же функциями подбора, поэтому точная таблица и подбор по
+        # подстроке всегда дают одинаковый результат
+        self._sport_table = self._build_table(
+            [sport.lower() for sport in SPORTS] +
+            [alias for aliases in SPORT_ALIASES.values() for alias in aliases],
+            match_sport
+        )
+        self._type_table = self._build_table(
+            ['внутреннее', 'выездное'], match_event_type
+        )
+        self._month_table = self._build_table(
+            [month.lower() for month in MONTHS] + list(MONTH_TRANSLATIONS), match_month
+        )
+        
+        # Результаты по исходным значениям
+        self._sport_cache: Dict[str, Optional[str]] = {}
+        self._type_cache: Dict[str, Optional[str]] = {}
+        self._month_cache: Dict[str, Optional[str]] = {}
+        
+        # Сколько значений пришлось подбирать по подстроке (для отладки)
+        self.fuzzy_lookups = 0
+    
+    @staticmethod
+    def _build_table(keys, match) -> Dict[str, Optional[str]]:
+        """Таблица точных совпадений: ключ -> результат подбора"""
+        return {key: match(key) for key in keys}
+    
+    def _resolve(self, value: str, cache: dict, table: dict, match) -> Optional[str]:
+        """
+        Нормализовать значение: кэш по исходному значению, затем точная
+        таблица, затем подбор по подстроке
+        
+        Returns:
+            Значение из констант или None
+        """
+        if not value:
+            return None
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        
+        key = value.lower().strip()
+        if key in table:
+            result = table[key]
+        else:
+            self.fuzzy_lookups += 1
+            result = match(key)
+        cache[value] = result
+        return result
+    
+    def sport(self, value: str) -> Optional[str]:
+        """Нормализация вида спорта - подбор из констант"""
+        return self._resolve(value, self._sport_cache, self._sport_table, match_sport)
+    
+    def event_type(self, value: str) -> Optional[str]:
+        """Нормализация типа мероприятия"""
+        return self._resolve(value, self._type_cache, self._type_table, match_event_type)
+    
+    def month(self, value: str) -> Optional[str]:
+        """Нормализация месяца"""
+        return self._resolve(value, self._month_cache, self._month_table, match_month)
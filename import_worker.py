@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Фоновый импорт мероприятий
+
+Разбор, нормализация, проверка и запись строк выполняются в отдельном
+потоке порциями, чтобы окно импорта не зависало на больших файлах.
+Окно получает сообщения о ходе работы через очередь (опрос через after()).
+"""
+
+import queue
+import threading
+import time
+from database import Database
+
+
+class ImportCancelled(Exception):
+    """Импорт отменён пользователем"""
+
+
+class ImportWorker(threading.Thread):
+    """Поток импорта мероприятий с записью в БД порциями"""
+    
+    def __init__(self, db_name: str, profile: str, rows, prepare_row, total: int = None,
+                 chunk_size: int = 500):
+        """
+        Инициализация потока импорта
+        
+        Args:
+            db_name: Файл БД (у потока своё подключение - объекты sqlite3
+                     нельзя использовать из другого потока)
+            profile: Профиль подключения Database
+            rows: Итерируемые строки исходных данных (читаются в потоке)
+            prepare_row: Функция строка -> (кортеж для add_events_bulk или None,
+                         список ошибок); вызывается в потоке, не должна трогать Tk
+            total: Общее количество строк, если известно (для прогресса)
+            chunk_size: Количество строк в одной транзакции
+        """
+        super().__init__(daemon=True)
+        self.db_name = db_name
+        self.profile = profile
+        self.rows = rows
+        self.prepare_row = prepare_row
+        self.total = total
+        self.chunk_size = chunk_size
+        
+        # Сообщения для окна: ('progress', обработано, импортировано, ошибок),
+        # ('done', результат) или ('error', текст ошибки, импортировано)
+        self.messages = queue.Queue()
+        self._cancel_event = threading.Event()
+        
+        # Мероприятий в зафиксированных порциях (остаются в БД и при ошибке)
+        self.imported = 0
+    
+    def cancel(self):
+        """Отменить импорт: текущая порция откатывается, записанные ранее остаются"""
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Запрошена ли отмена"""
+        return self._cancel_event.is_set()
+    
+    def run(self):
+        """Выполнить импорт (в отдельном потоке)"""
+        try:
+            result = self._import()
+        except Exception as e:
+            self.messages.put(('error', str(e), self.imported))
+        else:
+            self.messages.put(('done', result))
+    
+    def _import(self) -> dict:
+        """
+        Прочитать, подготовить и записать все строки порциями
+        
+        Returns:
+            Словарь: processed, imported, errors [(номер строки, описание)],
+            cancelled, elapsed (секунды), rows_per_second
+        """
+        start = time.perf_counter()
+        processed = 0
+        errors = []
+        chunk = []  # (номер строки, кортеж мероприятия)
+        
+        db = Database(self.db_name, profile=self.profile)
+        try:
+            for row_number, row in enumerate(self.rows, 1):
+                if self.cancelled:
+                    break
+                
+                event_row, row_errors = self.prepare_row(row)
+                processed += 1
+                if row_errors:
+                    errors.append((row_number, "; ".join(row_errors)))
+                else:
+                    chunk.append((row_number, event_row))
+                
+                if len(chunk) >= self.chunk_size:
+                    self.imported += self._write_chunk(db, chunk, errors)
+                    chunk = []
+                    self.messages.put(('progress', processed, self.imported, len(errors)))
+            
+            if chunk and not self.cancelled:
+                self.imported += self._write_chunk(db, chunk, errors)
+        except ImportCancelled:
+            pass
+        finally:
+            db.close()
+        
+        elapsed = time.perf_counter() - start
+        return {
+            'processed': processed,
+            'imported': self.imported,
+            'errors': sorted(errors),
+            'cancelled': self.cancelled,
+            'elapsed': elapsed,
+            'rows_per_second': processed / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def _write_chunk(self, db: Database, chunk: list, errors: list) -> int:
+        """
+        Записать порцию одной транзакцией
+        
+        Returns:
+            Количество добавленных мероприятий
+        """
+        with db.transaction():
+            event_ids, bulk_errors = db.add_events_bulk(event_row for _, event_row in chunk)
+            # Отмена во время записи - откатываем всю порцию
+            if self.cancelled:
+                raise ImportCancelled()
+        errors.extend((chunk[index][0], message) for index, message in bulk_errors)
+        return len(event_ids)
@@ -11,16 +11,57 @@ from database import Database
 from models import Event
 from add_event_window import AddEventWindow
 from view_plan_window import ViewPlanWindow
+from report_cache import ReportCache
 from clarify_event_window import ClarifyEventWindow
 from import_csv_window import ImportCSVWindow
 from backup_window import BackupWindow
 from backup_manager import BackupManager
 from data_check_window import DataCheckWindow
 from estimate_window import EstimateWindow
+from virtual_list import VirtualList
+from event_index import EventIndex
 from constants import SPORTS, MONTHS
 from styles import FONT_FAMILY, MONOSPACE_FONT
 
 
+# Задержка поиска после последнего нажатия клавиши (мс)
+SEARCH_DELAY_MS = 250
+
+# Быстрые фильтры: название -> (признак EventIndex, значение); "Все" - без условия
+QUICK_FILTERS = {
+    "Проведённые": ('status', "Проведено"),
+    "Запланированные": ('status', "Запланировано"),
+    "Отменённые": ('status', "Отменено"),
+    "Внутренние": ('event_type', "Внутреннее"),
+    "Выездные": ('event_type', "Выездное"),
+    "Избранные": ('favorite', True),
+}
+
+# Порядковые номера месяцев для сортировки
+MONTH_ORDER = {month: index for index, month in enumerate(MONTHS)}
+
+# Ключи сортировки по колонкам таблицы
+SORT_KEYS = {
+    'Статус': lambda e: e.status or "Запланировано",
+    'Месяц': lambda e: MONTH_ORDER.get(e.month, 999),
+    'Тип': lambda e: e.event_type,
+    'Спорт': lambda e: e.sport,
+    'Название': lambda e: e.name,
+    'Место': lambda e: e.location,
+    'Сумма на детей': lambda e: e.children_budget,
+    'Тренеров': lambda e: e.trainers_count,
+    'Сумма на тренеров': lambda e: e.trainers_budget,
+}
+
+# Теги строк таблицы по статусу: статус -> (тег, фон, цвет текста)
+STATUS_TAGS = {
+    "Проведено": ('status_done', '#D4EDDA', '#155724'),        # Зелёный
+    "Отменено": ('status_cancelled', '#F8D7DA', '#721C24'),    # Красный
+    "Перенесено": ('status_postponed', '#FFF3CD', '#856404'),  # Жёлтый
+    "Запланировано": ('status_planned', '#D1ECF1', '#0C5460'), # Голубой
+}
+
+
 def format_rubles(amount):
     """
     Форматировать сумму в российском стиле с разделителями
@@ -116,6 +157,9 @@ class MainWindow:
         # Инициализация БД
         self.db = Database()
         
+        # Готовые отчёты (общие для всех окон просмотра плана)
+        self.report_cache = ReportCache()
+        
         # Инициализация менеджера резервных копий
         self.backup_manager = BackupManager()
         
@@ -126,14 +170,27 @@ class MainWindow:
         self.current_year = datetime.now().year
         self.selected_year = tk.IntVar(value=self.current_year)
         
-        # Переменная для поиска
+        # Переменная для поиска (список обновляется после паузы в наборе)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self._load_events())
+        self.search_var.trace('w', lambda *args: self._schedule_search())
+        self._search_after_id = None
         
         # Переменные для сортировки
         self.sort_column = None
         self.sort_reverse = False
         
+        # Показанные в таблице мероприятия (в порядке строк) и строка поиска,
+        # по которой они отобраны - для сужения результатов без запроса к БД
+        self._shown_events = []
+        self._shown_query = ""
+        self._search_texts = {}  # id мероприятия -> текст для поиска
+        self._events_total = 0  # Мероприятий за год без фильтров
+        self._event_index = None  # Индекс мероприятий выбранного года (EventIndex)
+        
+        # Статистика года для дашборда и строки состояния и ключ (год, версия данных)
+        self._year_stats = None
+        self._year_stats_key = None
+        
         self._create_menu()
         self._create_widgets()
         self._setup_hotkeys()
@@ -643,6 +700,10 @@ class MainWindow:
         # Применяем кастомный стиль
         self.tree.configure(style='Custom.Treeview')
         
+        # Цветовая индикация по статусу - общие теги для всех строк
+        for tag, background, foreground in STATUS_TAGS.values():
+            self.tree.tag_configure(tag, background=background, foreground=foreground)
+        
         # Настраиваем столбцы с сортировкой
         self.tree.heading('★', text='★', command=lambda: self._sort_by_column('★'))
         self.tree.heading('Статус', text='Статус ▲▼', command=lambda: self._sort_by_column('Статус'))
@@ -666,10 +727,15 @@ class MainWindow:
         self.tree.column('Тренеры', width=160, minwidth=130)
         self.tree.column('Изменено', width=140, minwidth=120)
         
-        # Прокрутка
-        scrollbar_y = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        # Прокрутка (вертикальной управляет виртуальный список)
+        scrollbar_y = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
         scrollbar_x = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        self.tree.configure(xscrollcommand=scrollbar_x.set)
+        
+        # В таблице создаются только видимые строки - прокрутка больших
+        # списков не зависит от количества мероприятий
+        self.event_list = VirtualList(self.tree, scrollbar_y, self._event_row,
+                                      lambda event: str(event.id))
         
         # Размещение
         self.tree.grid(row=0, column=0, sticky='nsew')
@@ -724,124 +790,72 @@ class MainWindow:
     
     def _load_events(self):
         """Загрузить мероприятия из БД с учетом фильтров"""
-        # Очищаем таблицу
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._shown_events = []
+        self._search_texts = {}
+        self._shown_query = self.search_var.get().lower().strip()
         
         # Получаем мероприятия за выбранный год
         year = self.selected_year.get()
         events_data = self.db.get_events_by_year(year)
+        self._events_total = len(events_data)
+        
+        # Индекс фильтров: заново разбираются только изменившиеся мероприятия
+        if self._event_index is None or self._event_index.year != year:
+            self._event_index = EventIndex(year)
+        self._event_index.sync(events_data)
+        self._update_quick_filter_counts()
         
         if not events_data:
+            self.event_list.set_items([])
             self.status_var.set(f"Нет мероприятий на {year} год")
             return
         
         # Получаем значения фильтров
         sport_filter = self.sport_filter_var.get()
         month_filter = self.month_filter_var.get()
-        search_query = self.search_var.get().lower().strip()
+        search_query = self._shown_query
         quick_filter = self.quick_filter_var.get() if hasattr(self, 'quick_filter_var') else "Все"
         
-        # Применяем фильтры
-        filtered_count = 0
+        # Фильтры - пересечение множеств индекса
+        criteria = {}
+        if quick_filter in QUICK_FILTERS:
+            facet, value = QUICK_FILTERS[quick_filter]
+            criteria[facet] = value
+        if sport_filter != "Все":
+            criteria['sport'] = sport_filter
+        if month_filter != "Все":
+            criteria['month'] = month_filter
+        
         events_list = []  # Для сортировки
         
-        for row in events_data:
-            event = Event.from_db_row(row)
-            
-            # Быстрые фильтры
-            if quick_filter == "Проведённые" and event.status != "Проведено":
-                continue
-            elif quick_filter == "Запланированные" and event.status not in ("Запланировано", None):
-                continue
-            elif quick_filter == "Отменённые" and event.status != "Отменено":
-                continue
-            elif quick_filter == "Внутренние" and event.event_type != "Внутреннее":
-                continue
-            elif quick_filter == "Выездные" and event.event_type != "Выездное":
-                continue
-            elif quick_filter == "Избранные" and not event.is_favorite:
+        for event in self._event_index.select(criteria):
+            # Поиск по названию, месту, примечаниям (текст запоминается
+            # для последующего сужения поиска)
+            searchable_text = self._search_text(event)
+            self._search_texts[event.id] = searchable_text
+            if search_query and search_query not in searchable_text:
                 continue
             
-            # Фильтр по виду спорта
-            if sport_filter != "Все" and event.sport != sport_filter:
-                continue
-            
-            # Фильтр по месяцу
-            if month_filter != "Все" and event.month != month_filter:
-                continue
-            
-            # Поиск по названию, месту, примечаниям
-            if search_query:
-                searchable_text = f"{event.name} {event.location} {event.notes or ''}".lower()
-                if search_query not in searchable_text:
-                    continue
-            
             events_list.append(event)
         
         # Сортировка если нужно
         if self.sort_column:
             events_list = self._apply_sorting(events_list)
         
-        # Вставляем в таблицу
-        for event in events_list:
-            # Обрезаем название если слишком длинное
-            name = event.name if len(event.name) <= 50 else event.name[:47] + "..."
-            
-            status = event.status or "Запланировано"
-            
-            # Звёздочка для избранного
-            favorite_mark = "★" if event.is_favorite else "☆"
-            
-            # Формируем информацию о тренерах
-            trainers_info = ""
-            if event.trainers_list:
-                trainers_info = f"{len(event.trainers_list)} чел."
-            else:
-                trainers_info = f"{event.trainers_count} чел."
-            
-            # Дата последнего изменения
-            modified = ""
-            if event.last_modified:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(event.last_modified)
-                    modified = dt.strftime("%d.%m.%Y %H:%M")
-                except:
-                    modified = "-"
-            else:
-                modified = "-"
-            
-            # Вставляем строку
-            item_id = self.tree.insert('', tk.END, values=(
-                favorite_mark,
-                status,
-                event.month,
-                event.event_type,
-                event.sport,
-                name,
-                event.location,
-                format_rubles_compact(event.children_budget),
-                trainers_info,
-                modified
-            ), tags=(str(event.id),))
-            
-            # Цветовая индикация по статусу
-            if status == "Проведено":
-                self.tree.tag_configure(f"status_{item_id}", background='#D4EDDA', foreground='#155724')  # Зелёный
-            elif status == "Отменено":
-                self.tree.tag_configure(f"status_{item_id}", background='#F8D7DA', foreground='#721C24')  # Красный
-            elif status == "Перенесено":
-                self.tree.tag_configure(f"status_{item_id}", background='#FFF3CD', foreground='#856404')  # Жёлтый
-            else:  # Запланировано
-                self.tree.tag_configure(f"status_{item_id}", background='#D1ECF1', foreground='#0C5460')  # Голубой
-            
-            # Применяем тег
-            self.tree.item(item_id, tags=(str(event.id), f"status_{item_id}"))
-            
-            filtered_count += 1
+        # В таблице обновляются только видимые строки, которые изменились
+        self.event_list.set_items(events_list)
+        
+        self._shown_events = events_list
+        self._update_events_status()
+    
+    def _update_events_status(self):
+        """Обновить строку статуса: количество показанных мероприятий и активные фильтры"""
+        year = self.selected_year.get()
+        sport_filter = self.sport_filter_var.get()
+        month_filter = self.month_filter_var.get()
+        search_query = self._shown_query
+        filtered_count = len(self._shown_events)
         
-        # Обновляем статус с информацией о фильтрах
         filter_info = []
         if sport_filter != "Все":
             filter_info.append(f"🏅 {sport_filter}")
@@ -850,13 +864,97 @@ class MainWindow:
         if search_query:
             filter_info.append(f"🔍 \"{search_query}\"")
         
+        stats = self._get_year_stats()
         if filter_info:
-            status_text = f"Показано: {filtered_count} из {len(events_data)} | Активные фильтры: {' | '.join(filter_info)}"
+            status_text = f"Показано: {filtered_count} из {stats['total']} | Активные фильтры: {' | '.join(filter_info)}"
         else:
             status_text = f"Всего мероприятий: {filtered_count} на {year} год"
+        status_text += (f" | Проведено: {stats['completed']}, запланировано: {stats['planned']}, "
+                        f"отменено: {stats['cancelled']}")
         
         self.status_var.set(status_text)
     
+    @staticmethod
+    def _event_row(event) -> tuple:
+        """
+        Строка таблицы для мероприятия
+        
+        Returns:
+            Кортеж (id строки, значения колонок, теги)
+        """
+        # Обрезаем название если слишком длинное
+        name = event.name if len(event.name) <= 50 else event.name[:47] + "..."
+        
+        status = event.status or "Запланировано"
+        
+        # Звёздочка для избранного
+        favorite_mark = "★" if event.is_favorite else "☆"
+        
+        # Формируем информацию о тренерах
+        if event.trainers_list:
+            trainers_info = f"{len(event.trainers_list)} чел."
+        else:
+            trainers_info = f"{event.trainers_count} чел."
+        
+        # Дата последнего изменения
+        modified = "-"
+        if event.last_modified:
+            try:
+                modified = datetime.fromisoformat(event.last_modified).strftime("%d.%m.%Y %H:%M")
+            except:
+                pass
+        
+        values = (
+            favorite_mark,
+            status,
+            event.month,
+            event.event_type,
+            event.sport,
+            name,
+            event.location,
+            format_rubles_compact(event.children_budget),
+            trainers_info,
+            modified
+        )
+        status_tag = STATUS_TAGS.get(status, STATUS_TAGS["Запланировано"])[0]
+        # Первый тег - id мероприятия (по нему окна находят выбранное мероприятие)
+        return str(event.id), values, (str(event.id), status_tag)
+    
+    @staticmethod
+    def _search_text(event) -> str:
+        """Текст мероприятия для быстрого поиска (название, место, примечания)"""
+        return f"{event.name} {event.location} {event.notes or ''}".lower()
+    
+    def _schedule_search(self):
+        """Отложить поиск до паузы в наборе текста"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DELAY_MS, self._apply_search)
+    
+    def _apply_search(self):
+        """
+        Применить строку поиска
+        
+        Если новая строка продолжает предыдущую, показанные строки только
+        сужаются (без запроса к БД); иначе список загружается заново.
+        """
+        self._search_after_id = None
+        search_query = self.search_var.get().lower().strip()
+        
+        if search_query == self._shown_query:
+            return
+        if not self._events_total or not search_query.startswith(self._shown_query):
+            self._load_events()
+            return
+        
+        kept_events = [event for event in self._shown_events
+                       if search_query in self._search_texts[event.id]]
+        
+        self.event_list.set_items(kept_events)
+        self._shown_events = kept_events
+        self._shown_query = search_query
+        self._update_events_status()
+    
     def _reload_all(self):
         """Перезагрузить данные и обновить дашборд"""
         self._update_dashboard()
@@ -869,15 +967,13 @@ class MainWindow:
     
     def _edit_event(self):
         """Редактировать выбранное мероприятие"""
-        selection = self.tree.selection()
+        selection = self.event_list.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите мероприятие для редактирования")
             return
         
-        # Получаем ID мероприятия
-        item = selection[0]
-        tags = self.tree.item(item, 'tags')
-        event_id = int(tags[0])
+        # ID строки таблицы - ID мероприятия
+        event_id = int(selection[0])
         
         # Получаем данные мероприятия из БД
         event_data = self.db.get_event_by_id(event_id)
@@ -891,15 +987,13 @@ class MainWindow:
     
     def _clarify_event(self):
         """Уточнить детали выбранного мероприятия"""
-        selection = self.tree.selection()
+        selection = self.event_list.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите мероприятие для уточнения")
             return
         
-        # Получаем ID мероприятия
-        item = selection[0]
-        tags = self.tree.item(item, 'tags')
-        event_id = int(tags[0])
+        # ID строки таблицы - ID мероприятия
+        event_id = int(selection[0])
         
         # Получаем данные мероприятия из БД
         event_data = self.db.get_event_by_id(event_id)
@@ -912,15 +1006,13 @@ class MainWindow:
     
     def _manage_estimates(self):
         """Открыть окно управления сметами для выбранного мероприятия"""
-        selection = self.tree.selection()
+        selection = self.event_list.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите мероприятие для создания смет")
             return
         
-        # Получаем ID мероприятия
-        item = selection[0]
-        tags = self.tree.item(item, 'tags')
-        event_id = int(tags[0])
+        # ID строки таблицы - ID мероприятия
+        event_id = int(selection[0])
         
         # Получаем данные мероприятия из БД
         event_data = self.db.get_event_by_id(event_id)
@@ -935,7 +1027,7 @@ class MainWindow:
     
     def _delete_event(self):
         """Удалить выбранное мероприятие"""
-        selection = self.tree.selection()
+        selection = self.event_list.selected_ids()
         if not selection:
             messagebox.showwarning("Предупреждение", "Выберите мероприятие для удаления")
             return
@@ -944,10 +1036,8 @@ class MainWindow:
         if not messagebox.askyesno("Подтверждение", "Вы уверены, что хотите удалить мероприятие?"):
             return
         
-        # Получаем ID мероприятия
-        item = selection[0]
-        tags = self.tree.item(item, 'tags')
-        event_id = int(tags[0])
+        # ID строки таблицы - ID мероприятия
+        event_id = int(selection[0])
         
         try:
             self.db.delete_event(event_id)
@@ -1035,7 +1125,7 @@ class MainWindow:
             messagebox.showinfo("Информация", f"Нет мероприятий на {year} год")
             return
         
-        ViewPlanWindow(self.root, self.db, year)
+        ViewPlanWindow(self.root, self.db, year, report_cache=self.report_cache)
     
     def _open_report_direct(self, report_type: str):
         """
@@ -1051,7 +1141,8 @@ class MainWindow:
             messagebox.showinfo("Информация", f"Нет мероприятий на {year} год")
             return
         
-        ViewPlanWindow(self.root, self.db, year, initial_report_type=report_type)
+        ViewPlanWindow(self.root, self.db, year, initial_report_type=report_type,
+                       report_cache=self.report_cache)
     
     def _check_data(self):
         """Открыть окно проверки целостности данных"""
@@ -1060,15 +1151,14 @@ class MainWindow:
     
     def _duplicate_event(self):
         """Дублировать выбранное мероприятие"""
-        selection = self.tree.selection()
+        selection = self.event_list.selected_ids()
         
         if not selection:
             messagebox.showwarning("Внимание", "Выберите мероприятие для дублирования")
             return
         
-        # Получаем ID события
-        item = selection[0]
-        event_id = int(self.tree.item(item, 'tags')[0])
+        # ID строки таблицы - ID мероприятия
+        event_id = int(selection[0])
         
         # Получаем событие из БД
         event_data = self.db.get_event_by_id(event_id)
@@ -1087,7 +1177,14 @@ class MainWindow:
     
     def _open_backup_window(self):
         """Открыть окно управления резервными копиями"""
-        BackupWindow(self.root)
+        BackupWindow(self.root, callback=self._on_backup_restored)
+    
+    def _on_backup_restored(self):
+        """Сбросить кэши после восстановления БД из резервной копии"""
+        # Счётчик записей восстановленной БД может совпасть с прежним -
+        # отчёты в памяти построены по заменённым данным
+        self.report_cache.clear()
+        self.db.clear_event_cache()
     
     def _auto_backup(self):
         """Автоматическое резервное копирование (раз в день)"""
@@ -1154,38 +1251,30 @@ class MainWindow:
             self.sort_column = column
             self.sort_reverse = False
         
-        # Перезагружаем данные с сортировкой
-        self._load_events()
+        if column not in SORT_KEYS:
+            # Колонка без сортировки - исходный порядок
+            self._load_events()
+            return
+        
+        # Данные не перечитываем - переставляем уже отобранные мероприятия
+        self._shown_events = self._apply_sorting(self._shown_events)
+        self.event_list.set_items(self._shown_events)
     
     def _apply_sorting(self, events_list):
-        """Применить сортировку к списку событий"""
-        column = self.sort_column
-        reverse = self.sort_reverse
-        
-        # Определяем ключ сортировки
-        if column == 'Статус':
-            key_func = lambda e: e.status or "Запланировано"
-        elif column == 'Месяц':
-            # Сортируем по индексу месяца
-            key_func = lambda e: MONTHS.index(e.month) if e.month in MONTHS else 999
-        elif column == 'Тип':
-            key_func = lambda e: e.event_type
-        elif column == 'Спорт':
-            key_func = lambda e: e.sport
-        elif column == 'Название':
-            key_func = lambda e: e.name
-        elif column == 'Место':
-            key_func = lambda e: e.location
-        elif column == 'Сумма на детей':
-            key_func = lambda e: e.children_budget
-        elif column == 'Тренеров':
-            key_func = lambda e: e.trainers_count
-        elif column == 'Сумма на тренеров':
-            key_func = lambda e: e.trainers_budget
-        else:
+        """
+        Применить сортировку к списку событий
+        
+        Порядок берётся из перестановки индекса (сортировка выполняется
+        один раз для версии данных), список только отбирается по ней.
+        """
+        key_func = SORT_KEYS.get(self.sort_column)
+        if key_func is None or self._event_index is None:
             return events_list
         
-        return sorted(events_list, key=key_func, reverse=reverse)
+        order = self._event_index.sort_order(self.sort_column, key_func, self.sort_reverse)
+        shown_ids = {event.id for event in events_list}
+        events = self._event_index.events
+        return [events[event_id] for event_id in order if event_id in shown_ids]
     
     def _apply_sport_filter(self, sport):
         """Применить фильтр по виду спорта из меню"""
@@ -1401,30 +1490,35 @@ class MainWindow:
         )
         text_label.pack(pady=(0, 8))
     
+    def _get_year_stats(self) -> dict:
+        """
+        Статистика выбранного года (Database.get_year_stats)
+        
+        Запрос повторяется только при смене года или изменении данных,
+        поэтому дашборд и строка состояния используют один результат.
+        """
+        year = self.selected_year.get()
+        key = (year, self.db.data_version)
+        if key != self._year_stats_key:
+            self._year_stats = self.db.get_year_stats(year)
+            self._year_stats_key = key
+        return self._year_stats
+    
     def _update_dashboard(self):
         """Обновить статистику на дашборде"""
-        year = self.selected_year.get()
-        events_data = self.db.get_events_by_year(year)
+        stats = self._get_year_stats()
         
-        if not events_data:
+        if not stats['total']:
             for key in self.dashboard_vars:
                 self.dashboard_vars[key].set("0")
             return
         
-        total = len(events_data)
-        completed = sum(1 for row in events_data if row[11] == "Проведено")
-        planned = sum(1 for row in events_data if row[11] in ("Запланировано", None))
-        cancelled = sum(1 for row in events_data if row[11] == "Отменено")
-        
-        children_budget = sum(row[7] for row in events_data)
-        trainers_budget = sum(row[9] for row in events_data)
-        
-        self.dashboard_vars["total"].set(str(total))
-        self.dashboard_vars["completed"].set(str(completed))
-        self.dashboard_vars["planned"].set(str(planned))
-        self.dashboard_vars["cancelled"].set(str(cancelled))
-        self.dashboard_vars["children_budget"].set(format_rubles(children_budget))
-        self.dashboard_vars["trainers_budget"].set(format_rubles(trainers_budget))
+        self.dashboard_vars["total"].set(str(stats['total']))
+        self.dashboard_vars["completed"].set(str(stats['completed']))
+        self.dashboard_vars["planned"].set(str(stats['planned']))
+        self.dashboard_vars["cancelled"].set(str(stats['cancelled']))
+        self.dashboard_vars["children_budget"].set(format_rubles(stats['children_budget']))
+        self.dashboard_vars["trainers_budget"].set(format_rubles(stats['trainers_budget']))
     
     def _create_quick_filters(self):
         """Создать панель быстрых фильтров"""
@@ -1454,6 +1548,7 @@ class MainWindow:
             "Избранные"
         ]
         
+        self.quick_filter_buttons = {}
         for filter_name in quick_filters:
             btn = tk.Button(
                 filters_frame,
@@ -1469,6 +1564,7 @@ class MainWindow:
                 bd=1
             )
             btn.pack(side=tk.LEFT, padx=2)
+            self.quick_filter_buttons[filter_name] = btn
             
             # Hover эффект
             def make_filter_hover(button):
@@ -1483,6 +1579,17 @@ class MainWindow:
             
             make_filter_hover(btn)
     
+    def _update_quick_filter_counts(self):
+        """Показать на кнопках быстрых фильтров количество мероприятий (из индекса)"""
+        if not hasattr(self, 'quick_filter_buttons'):
+            return
+        for filter_name, button in self.quick_filter_buttons.items():
+            if filter_name in QUICK_FILTERS:
+                count = self._event_index.count(*QUICK_FILTERS[filter_name])
+            else:
+                count = len(self._event_index.events)
+            button.config(text=f"{filter_name} ({count})")
+    
     def _apply_quick_filter(self, filter_name):
         """Применить быстрый фильтр"""
         self.quick_filter_var.set(filter_name)
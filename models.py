@@ -6,9 +6,35 @@
 import json
 
 
+def _parse_trainers_json(trainers_json: str) -> list:
+    """Разобрать JSON список тренеров (пустой список, если JSON нет или он повреждён)"""
+    if not trainers_json:
+        return []
+    try:
+        return json.loads(trainers_json)
+    except:
+        return []
+
+
 class Event:
     """Класс модели мероприятия"""
     
+    # Без __dict__ у каждого экземпляра - в списках на тысячи мероприятий
+    # это основная часть памяти объекта
+    __slots__ = (
+        'id', 'year', 'sport', 'event_type', 'name', 'location', 'month',
+        'children_budget', 'trainers_count', 'trainers_budget', 'notes', 'status',
+        'actual_start_date', 'actual_end_date', 'actual_children_budget',
+        'actual_trainers_budget', 'cancellation_reason', 'postponement_reason',
+        'is_favorite', 'last_modified', 'trainers_json', 'actual_trainers_json',
+        '_trainers_list', '_actual_trainers_list'
+    )
+    
+    # Значения отсутствующих столбцов для коротких строк from_db_row
+    # (строка БД содержит столбцы в порядке аргументов __init__)
+    _ROW_DEFAULTS = (None, None, "", "", "", "", "", 0.0, 1, 0.0, "", "Запланировано",
+                     None, None, None, None, None, None, 0, None, None, None)
+    
     def __init__(self, event_id: int = None, year: int = None, sport: str = "", 
                  event_type: str = "", name: str = "", location: str = "", 
                  month: str = "", children_budget: float = 0.0, 
@@ -44,6 +70,10 @@ class Event:
             is_favorite: Избранное (0/1)
             last_modified: Время последнего изменения
             trainers_json: JSON список тренеров
+            actual_trainers_json: JSON список тренеров (факт)
+        
+        JSON тренеров разбирается при первом обращении к trainers_list /
+        actual_trainers_list.
         """
         self.id = event_id
         self.year = year
@@ -68,21 +98,31 @@ class Event:
         self.trainers_json = trainers_json
         self.actual_trainers_json = actual_trainers_json
         
-        # Парсим JSON тренеров (план)
-        self.trainers_list = []
-        if trainers_json:
-            try:
-                self.trainers_list = json.loads(trainers_json)
-            except:
-                self.trainers_list = []
-        
-        # Парсим JSON тренеров (факт)
-        self.actual_trainers_list = []
-        if actual_trainers_json:
-            try:
-                self.actual_trainers_list = json.loads(actual_trainers_json)
-            except:
-                self.actual_trainers_list = []
+        # Разобранные списки тренеров (None - ещё не разбирались)
+        self._trainers_list = None
+        self._actual_trainers_list = None
+    
+    @property
+    def trainers_list(self) -> list:
+        """Список тренеров (план): [{"name": ..., "budget": ...}, ...]"""
+        if self._trainers_list is None:
+            self._trainers_list = _parse_trainers_json(self.trainers_json)
+        return self._trainers_list
+    
+    @trainers_list.setter
+    def trainers_list(self, value: list):
+        self._trainers_list = value
+    
+    @property
+    def actual_trainers_list(self) -> list:
+        """Список тренеров (факт)"""
+        if self._actual_trainers_list is None:
+            self._actual_trainers_list = _parse_trainers_json(self.actual_trainers_json)
+        return self._actual_trainers_list
+    
+    @actual_trainers_list.setter
+    def actual_trainers_list(self, value: list):
+        self._actual_trainers_list = value
     
     @classmethod
     def from_db_row(cls, row: tuple):
@@ -95,30 +135,10 @@ class Event:
         Returns:
             Объект Event
         """
-        return cls(
-            event_id=row[0],
-            year=row[1],
-            sport=row[2],
-            event_type=row[3],
-            name=row[4],
-            location=row[5],
-            month=row[6],
-            children_budget=row[7],
-            trainers_count=row[8],
-            trainers_budget=row[9],
-            notes=row[10] if len(row) > 10 else "",
-            status=row[11] if len(row) > 11 else "Запланировано",
-            actual_start_date=row[12] if len(row) > 12 else None,
-            actual_end_date=row[13] if len(row) > 13 else None,
-            actual_children_budget=row[14] if len(row) > 14 else None,
-            actual_trainers_budget=row[15] if len(row) > 15 else None,
-            cancellation_reason=row[16] if len(row) > 16 else None,
-            postponement_reason=row[17] if len(row) > 17 else None,
-            is_favorite=row[18] if len(row) > 18 else 0,
-            last_modified=row[19] if len(row) > 19 else None,
-            trainers_json=row[20] if len(row) > 20 else None,
-            actual_trainers_json=row[21] if len(row) > 21 else None
-        )
+        # Строки старых запросов могут быть короче - дополняем значениями по умолчанию
+        if len(row) < len(cls._ROW_DEFAULTS):
+            row = tuple(row) + cls._ROW_DEFAULTS[len(row):]
+        return cls(*row)
     
     def to_tuple(self):
         """
@@ -141,6 +161,9 @@ class Event:
 class Estimate:
     """Класс модели сметы"""
     
+    __slots__ = ('id', 'event_id', 'estimate_type', 'trainer_name', 'approved_by', 'place',
+                 'start_date', 'end_date', 'created_date', 'total_amount', 'items')
+    
     def __init__(self, estimate_id: int = None, event_id: int = None,
                  estimate_type: str = "", trainer_name: str = None,
                  approved_by: str = "", place: str = "", start_date: str = "",
@@ -183,18 +206,7 @@ class Estimate:
         Returns:
             Объект Estimate
         """
-        return cls(
-            estimate_id=row[0],
-            event_id=row[1],
-            estimate_type=row[2],
-            trainer_name=row[3],
-            approved_by=row[4],
-            place=row[5],
-            start_date=row[6],
-            end_date=row[7],
-            created_date=row[8],
-            total_amount=row[9]
-        )
+        return cls(*row[:10])
     
     def __str__(self):
         """Строковое представление сметы"""
@@ -206,6 +218,9 @@ class Estimate:
 class EstimateItem:
     """Класс модели статьи расходов сметы"""
     
+    __slots__ = ('id', 'estimate_id', 'category', 'description', 'people_count',
+                 'days_count', 'rate', 'total')
+    
     def __init__(self, item_id: int = None, estimate_id: int = None,
                  category: str = "", description: str = "",
                  people_count: int = 0, days_count: int = 0,
@@ -243,16 +258,7 @@ class EstimateItem:
         Returns:
             Объект EstimateItem
         """
-        return cls(
-            item_id=row[0],
-            estimate_id=row[1],
-            category=row[2],
-            description=row[3],
-            people_count=row[4],
-            days_count=row[5],
-            rate=row[6],
-            total=row[7]
-        )
+        return cls(*row[:8])
     
     def __str__(self):
         """Строковое представление статьи расходов"""
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Кэш готовых отчётов
+
+Хранит построенный вывод отчётов (текст, CSV, HTML) по ключу
+(год, тип отчёта, формат, Database.write_version). Любая запись в БД меняет
+write_version, поэтому устаревший вывод по новому ключу не найдётся.
+В памяти хранится ограниченный объём, при переполнении вытесняются давно
+не использованные отчёты. Дополнительно вывод можно хранить на диске рядом
+с БД - тогда он переживает перезапуск приложения.
+"""
+
+import os
+import sys
+from collections import OrderedDict
+from typing import Optional
+
+
+class ReportCache:
+    """Кэш вывода отчётов с вытеснением давно не использованных"""
+    
+    # Объём кэша в памяти по умолчанию (байт)
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: str = None):
+        """
+        Создать кэш
+        
+        Args:
+            max_bytes: Предельный объём вывода в памяти (байт)
+            directory: Папка для хранения на диске (None - только в памяти)
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Ключ -> (вывод, размер); порядок - от давно использованных к недавним
+        self._entries: OrderedDict = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def directory_for(db_name: str) -> str:
+        """Папка кэша на диске рядом с файлом БД"""
+        db_path = os.path.abspath(db_name)
+        return os.path.join(os.path.dirname(db_path), os.path.basename(db_path) + '.reports')
+    
+    def get(self, year: int, report_type: str, output_format: str, version: int) -> Optional[str]:
+        """
+        Получить вывод отчёта
+        
+        Args:
+            year: Год отчёта
+            report_type: Тип отчёта ('full', 'annual_ppo', ...)
+            output_format: Формат ('txt', 'csv', 'html')
+            version: Database.write_version, по которому построен вывод
+        
+        Returns:
+            Вывод или None, если его нет в кэше
+        """
+        key = (year, report_type, output_format, version)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        
+        content = self._read_file(key)
+        if content is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._store(key, content)
+        return content
+    
+    def put(self, year: int, report_type: str, output_format: str, version: int, content: str):
+        """Сохранить вывод отчёта (см. get)"""
+        key = (year, report_type, output_format, version)
+        self._store(key, content)
+        self._write_file(key, content)
+    
+    def clear(self):
+        """Очистить кэш в памяти (файлы на диске не удаляются)"""
+        self._entries.clear()
+        self.size = 0
+    
+    def _store(self, key: tuple, content: str):
+        """Положить вывод в память и вытеснить лишнее"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        
+        size = sys.getsizeof(content)
+        if size > self.max_bytes:
+            return  # Не помещается даже в пустой кэш
+        
+        self._entries[key] = (content, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+    
+    def _file_prefix(self, key: tuple) -> str:
+        """Начало имени файла: одинаковое для всех версий отчёта в формате"""
+        year, report_type, output_format, _ = key
+        return f"{year}_{report_type}_{output_format}_"
+    
+    def _file_path(self, key: tuple) -> str:
+        return os.path.join(self.directory, f"{self._file_prefix(key)}{key[3]}.cache")
+    
+    def _read_file(self, key: tuple) -> Optional[str]:
+        """Прочитать вывод с диска (None - нет файла или кэш только в памяти)"""
+        if not self.directory:
+            return None
+        try:
+            with open(self._file_path(key), 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_file(self, key: tuple, content: str):
+        """
+        Записать вывод на диск
+        
+        Файлы прежних версий того же отчёта удаляются, поэтому на диске
+        хранится не больше одного файла на год, тип и формат. Ошибки записи
+        не мешают работе - кэш на диске необязателен.
+        """
+        if not self.directory:
+            return
+        path = self._file_path(key)
+        prefix = self._file_prefix(key)
+        try:
+            # Запись через временный файл: другой процесс не прочитает половину
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+            
+            for name in os.listdir(self.directory):
+                version = name[len(prefix):-len('.cache')]
+                if name.startswith(prefix) and name.endswith('.cache') and version.isdigit() \
+                        and int(version) != key[3]:
+                    os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
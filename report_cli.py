@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Построение отчётов календарного плана из командной строки
+
+Работает без графического интерфейса (tkinter не импортируется), поэтому
+подходит для запуска по расписанию (cron) на сервере без дисплея.
+Отчёты строятся тем же кодом, что и в окне просмотра плана (plan_reports),
+и совпадают с сохранёнными из окна.
+
+Команда batch выгружает все отчёты за все годы во всех форматах: задания
+(год x тип отчёта x формат) выполняются параллельно в пуле процессов,
+у каждого процесса своё подключение к БД только для чтения. Файлы
+записываются в папку <output>/<дата>/<год>/.
+
+Запуск:
+    python -m report_cli report --year 2025 --type annual_ppo --format html,csv,txt
+    python -m report_cli report --year 2025 --type all --output отчёты --cache
+    python -m report_cli batch --output выгрузка --jobs 4
+
+Код возврата: 0 - все отчёты построены, 1 - ошибка (текст в stderr).
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, Tuple
+from database import CONNECTION_PROFILES, Database
+from plan_reports import (OUTPUT_FORMATS, PlanReports, REPORT_TYPES,
+                          report_file_name, write_report_file)
+from report_cache import ReportCache
+from report_dataset import ReportDataset
+
+
+def parse_formats(value: str) -> List[str]:
+    """
+    Разобрать список форматов через запятую
+    
+    Args:
+        value: Строка вида "html,csv,txt"
+    
+    Returns:
+        Форматы без повторов в порядке указания
+    """
+    formats = []
+    for name in value.split(','):
+        name = name.strip().lower()
+        if name not in OUTPUT_FORMATS:
+            raise argparse.ArgumentTypeError(
+                f"неизвестный формат '{name}' (допустимы: {', '.join(OUTPUT_FORMATS)})"
+            )
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        prog='python -m report_cli',
+        description="Отчёты календарного плана без графического интерфейса"
+    )
+    parser.add_argument('--db', default="calendar_plans.db",
+                        help="файл базы данных (по умолчанию calendar_plans.db)")
+    parser.add_argument('--profile', default=None, choices=tuple(CONNECTION_PROFILES),
+                        help="профиль подключения к БД (по умолчанию - как у приложения); "
+                             "режим журнала файла БД не меняется")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    report = commands.add_parser('report', help="построить отчёты за год")
+    report.add_argument('--year', type=int, required=True, help="год плана")
+    report.add_argument('--type', dest='report_types', default='all',
+                        choices=REPORT_TYPES + ('all',),
+                        help="тип отчёта (по умолчанию all - все)")
+    report.add_argument('--format', dest='formats', type=parse_formats, default=['txt'],
+                        help="форматы через запятую: txt, csv, html (по умолчанию txt)")
+    report.add_argument('--output', default='.',
+                        help="папка для файлов отчётов (по умолчанию текущая)")
+    report.add_argument('--cache', action='store_true',
+                        help="использовать кэш отчётов на диске рядом с БД (общий с приложением)")
+    
+    batch = commands.add_parser('batch', help="выгрузить все отчёты за все годы")
+    batch.add_argument('--format', dest='formats', type=parse_formats,
+                       default=list(OUTPUT_FORMATS),
+                       help="форматы через запятую (по умолчанию все: txt, csv, html)")
+    batch.add_argument('--output', default='reports',
+                       help="корневая папка выгрузки (по умолчанию reports)")
+    batch.add_argument('--jobs', type=int, default=None,
+                       help="число процессов (по умолчанию - число ядер)")
+    return parser
+
+
+def run_report(args) -> int:
+    """
+    Построить отчёты за год и записать их в файлы
+    
+    Ошибка одного отчёта не прерывает остальные.
+    
+    Returns:
+        Код возврата (1 - хотя бы один отчёт не построен)
+    """
+    if not os.path.exists(args.db):
+        print(f"Файл базы данных не найден: {args.db}", file=sys.stderr)
+        return 1
+    
+    report_types = REPORT_TYPES if args.report_types == 'all' else (args.report_types,)
+    cache = ReportCache(directory=ReportCache.directory_for(args.db)) if args.cache else None
+    os.makedirs(args.output, exist_ok=True)
+    
+    db = Database(args.db, profile=args.profile)
+    try:
+        reports = PlanReports(args.year)
+        dataset = None  # Загружается только при промахе кэша
+        version = db.write_version
+        
+        failed = 0
+        for report_type in report_types:
+            for output_format in args.formats:
+                start = time.perf_counter()
+                filename = os.path.join(args.output, report_file_name(args.year, report_type, output_format))
+                try:
+                    content = cache.get(args.year, report_type, output_format, version) if cache else None
+                    if content is None:
+                        if dataset is None:
+                            dataset = ReportDataset(db, args.year)
+                        content = reports.render(report_type, output_format, dataset)
+                        if cache:
+                            cache.put(args.year, report_type, output_format, version, content)
+                    write_report_file(filename, output_format, content)
+                except Exception as e:
+                    failed += 1
+                    print(f"{filename}: ОШИБКА: {e}", file=sys.stderr)
+                    continue
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                print(f"{filename} ({elapsed_ms:.0f} мс)")
+    finally:
+        db.close()
+    
+    if failed:
+        print(f"Не построено отчётов: {failed}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Состояние процесса пула: подключение только для чтения и наборы данных
+# по годам (процесс загружает год один раз, сколько бы заданий ни получил)
+_worker_db = None
+_worker_datasets: Dict[int, ReportDataset] = {}
+
+
+def _init_worker(db_name: str, profile: str):
+    """Открыть подключение процесса пула"""
+    global _worker_db
+    _worker_db = Database(db_name, profile=profile, read_only=True)
+
+
+def _export_job(year: int, report_type: str, output_format: str, directory: str) -> Tuple[str, float, int]:
+    """
+    Построить и записать один отчёт (выполняется в процессе пула)
+    
+    Returns:
+        (имя файла, время в мс, номер процесса)
+    """
+    start = time.perf_counter()
+    dataset = _worker_datasets.get(year)
+    if dataset is None:
+        dataset = _worker_datasets[year] = ReportDataset(_worker_db, year)
+    content = PlanReports(year).render(report_type, output_format, dataset)
+    
+    filename = os.path.join(directory, report_file_name(year, report_type, output_format))
+    write_report_file(filename, output_format, content)
+    return filename, (time.perf_counter() - start) * 1000, os.getpid()
+
+
+def run_batch(args) -> int:
+    """
+    Выгрузить все отчёты за все годы параллельно
+    
+    Returns:
+        Код возврата (1 - хотя бы одно задание завершилось ошибкой)
+    """
+    if not os.path.exists(args.db):
+        print(f"Файл базы данных не найден: {args.db}", file=sys.stderr)
+        return 1
+    
+    # Обычное подключение: применяет миграции, после чего процессы пула
+    # могут открыть БД только для чтения
+    db = Database(args.db, profile=args.profile)
+    try:
+        years = db.get_all_years()
+    finally:
+        db.close()
+    if not years:
+        print("В базе данных нет мероприятий")
+        return 0
+    
+    root = os.path.join(args.output, date.today().isoformat())
+    jobs = []
+    for year in years:
+        directory = os.path.join(root, str(year))
+        os.makedirs(directory, exist_ok=True)
+        for report_type in REPORT_TYPES:
+            for output_format in args.formats:
+                jobs.append((year, report_type, output_format, directory))
+    
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                             initargs=(args.db, args.profile)) as pool:
+        futures = [pool.submit(_export_job, *job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results.append((job, future.result(), None))
+            except Exception as e:
+                results.append((job, None, str(e)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"{'Год':<6} {'Отчёт':<12} {'Формат':<7} {'Время, мс':>10} {'Процесс':>8}  Файл / ошибка")
+    failed = 0
+    jobs_ms = 0.0
+    for (year, report_type, output_format, _), result, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{year:<6} {report_type:<12} {output_format:<7} {'-':>10} {'-':>8}  ОШИБКА: {error}")
+            continue
+        filename, job_ms, pid = result
+        jobs_ms += job_ms
+        print(f"{year:<6} {report_type:<12} {output_format:<7} {job_ms:>10.1f} {pid:>8}  {filename}")
+    
+    print(f"\nЗаданий: {len(jobs)}, ошибок: {failed}, годов: {len(years)}")
+    print(f"Сумма времени заданий: {jobs_ms:.0f} мс, общее время: {elapsed_ms:.0f} мс")
+    print(f"Папка выгрузки: {root}")
+    return 1 if failed else 0
+
+
+def main(argv: List[str] = None) -> int:
+    """Точка входа командной строки"""
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == 'report':
+            return run_report(args)
+        if args.command == 'batch':
+            return run_batch(args)
+    except Exception as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Набор данных отчётов за год
+
+Мероприятия года загружаются из БД один раз, группируются по месяцам,
+кварталам, видам спорта, статусам и типам, и затем используются всеми
+отчётами и форматами экспорта.
+"""
+
+from typing import Dict, List
+from models import Event
+from year_frame import YearFrame, empty_sums
+
+
+# Месяцы по кварталам
+QUARTER_MONTHS = {
+    1: ['Январь', 'Февраль', 'Март'],
+    2: ['Апрель', 'Май', 'Июнь'],
+    3: ['Июль', 'Август', 'Сентябрь'],
+    4: ['Октябрь', 'Ноябрь', 'Декабрь']
+}
+
+# Типы мероприятий
+EVENT_TYPES = ("Внутреннее", "Выездное")
+
+# Порядок статусов в отчётах
+STATUS_ORDER = ["Проведено", "Запланировано", "Перенесено", "Отменено"]
+
+
+def get_quarter(month: str) -> int:
+    """
+    Определить квартал по названию месяца
+    
+    Args:
+        month: Название месяца
+    
+    Returns:
+        Номер квартала (1-4); для неизвестного месяца - 1
+    """
+    for quarter, months in QUARTER_MONTHS.items():
+        if month in months:
+            return quarter
+    return 1
+
+
+class ReportDataset:
+    """Мероприятия года с готовыми группировками и итогами для отчётов"""
+    
+    def __init__(self, db, year: int):
+        """
+        Загрузить мероприятия года и построить группировки
+        
+        Args:
+            db: Объект базы данных
+            year: Год отчёта
+        """
+        self.db = db
+        self.year = year
+        # Версия данных, по которой построен набор
+        self.data_version = db.data_version
+        
+        rows = db.get_events_by_year(year)
+        self.events: List[Event] = [Event.from_db_row(row) for row in rows]
+        
+        # Колоночный снимок года: суммы по любым группировкам одним проходом
+        self.frame = YearFrame(rows)
+        
+        # Группировки (порядок мероприятий внутри групп - как в events)
+        self.by_month: Dict[str, List[Event]] = {}
+        self.by_quarter: Dict[int, List[Event]] = {1: [], 2: [], 3: [], 4: []}
+        self.by_sport: Dict[str, List[Event]] = {}
+        self.by_status: Dict[str, List[Event]] = {}
+        self.by_type: Dict[str, List[Event]] = {event_type: [] for event_type in EVENT_TYPES}
+        
+        for event in self.events:
+            self.by_month.setdefault(event.month, []).append(event)
+            self.by_quarter[get_quarter(event.month)].append(event)
+            self.by_sport.setdefault(event.sport, []).append(event)
+            self.by_status.setdefault(event.status or "Запланировано", []).append(event)
+            self.by_type.setdefault(event.event_type, []).append(event)
+        
+        self.away_events = self.by_type["Выездное"]
+        self.internal_events = self.by_type["Внутреннее"]
+        
+        # Итоги по году: количество и плановые/фактические суммы. Факт - только
+        # для проведённых мероприятий (если факт не указан - берётся план)
+        self.totals = self.frame.totals()
+        
+        # Сметы загружаются только при первом обращении (нужны годовым отчётам)
+        self._estimates = None
+    
+    def stats_by_sport(self) -> Dict[str, dict]:
+        """
+        Суммы по видам спорта
+        
+        Returns:
+            Словарь {вид спорта: {показатель: сумма}} (показатели - MEASURES
+            из year_frame) в порядке первого появления вида спорта
+        """
+        return self.frame.group_sum(('sport',))
+    
+    def stats_by_sport_and_type(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Суммы по видам спорта с разбивкой на внутренние и выездные
+        
+        Returns:
+            Словарь {вид спорта: {тип: {показатель: сумма}}}; для типа без
+            мероприятий - нулевые суммы
+        """
+        result = {}
+        for (sport, event_type), sums in self.frame.group_sum(('sport', 'event_type')).items():
+            sport_types = result.setdefault(sport, {t: empty_sums() for t in EVENT_TYPES})
+            sport_types[event_type] = sums
+        return result
+    
+    def stats_by_type(self) -> Dict[str, dict]:
+        """Суммы по типам мероприятий (для типа без мероприятий - нули)"""
+        by_type = self.frame.group_sum(('event_type',))
+        return {event_type: by_type.get(event_type, empty_sums()) for event_type in EVENT_TYPES}
+    
+    @property
+    def estimates(self) -> Dict[int, Dict[str, List[tuple]]]:
+        """Сметы и статьи расходов за год (см. Database.get_year_estimates)"""
+        if self._estimates is None:
+            self._estimates = self.db.get_year_estimates(self.year)
+        return self._estimates
+    
+    def is_current(self) -> bool:
+        """Проверить, что данные в БД не менялись после построения набора"""
+        return self.data_version == self.db.data_version
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Фоновое построение отчётов окна просмотра плана
+
+Отчёты строятся в отдельном потоке со своим подключением к БД, чтобы
+окно не зависало на больших годах. Поток живёт, пока открыто окно, и
+держит набор данных года между отчётами. Окно ставит отчёты в очередь и
+получает сообщения о ходе работы через очередь (опрос через after()).
+Новый запрос отменяет все предыдущие: незапущенные пропускаются,
+отмена проверяется перед загрузкой данных и перед построением отчёта, а
+результат уже строящегося отбрасывается. Поток только читает БД.
+"""
+
+import queue
+import threading
+from database import Database
+from report_dataset import ReportDataset
+
+
+class ReportWorker(threading.Thread):
+    """Поток построения отчётов за год"""
+    
+    def __init__(self, db_name: str, profile: str, year: int):
+        """
+        Инициализация потока отчётов
+        
+        Args:
+            db_name: Файл БД (у потока своё подключение - объекты sqlite3
+                     нельзя использовать из другого потока)
+            profile: Профиль подключения Database
+            year: Год отчётов
+        """
+        super().__init__(daemon=True)
+        self.db_name = db_name
+        self.profile = profile
+        self.year = year
+        
+        # Запросы: (номер, функция построения) или None для остановки
+        self.requests = queue.Queue()
+        # Сообщения для окна: ('progress', номер, текст этапа),
+        # ('done', номер, текст отчёта) или ('error', номер, текст ошибки)
+        self.messages = queue.Queue()
+        
+        # Номер последнего запроса; запросы с меньшим номером отменены
+        self._latest = 0
+    
+    def submit(self, build) -> int:
+        """
+        Поставить отчёт в очередь, отменив предыдущие
+        
+        Args:
+            build: Функция ReportDataset -> текст отчёта; вызывается в потоке,
+                   не должна трогать Tk
+        
+        Returns:
+            Номер запроса (приходит во всех сообщениях о нём)
+        """
+        self._latest += 1
+        self.requests.put((self._latest, build))
+        return self._latest
+    
+    def cancel(self):
+        """Отменить все поставленные отчёты"""
+        self._latest += 1
+    
+    def stop(self):
+        """Завершить поток после текущего отчёта"""
+        self.cancel()
+        self.requests.put(None)
+    
+    def is_cancelled(self, request_id: int) -> bool:
+        """Отменён ли запрос (поставлен более новый или вызван cancel)"""
+        return request_id != self._latest
+    
+    def run(self):
+        """Обрабатывать запросы до остановки (в отдельном потоке)"""
+        try:
+            db = Database(self.db_name, profile=self.profile, read_only=True)
+        except Exception as e:
+            self._fail_requests(str(e))
+            return
+        
+        dataset = None
+        try:
+            while True:
+                request = self._next_request()
+                if request is None:
+                    break
+                
+                request_id, build = request
+                if self.is_cancelled(request_id):
+                    continue
+                
+                try:
+                    # Набор данных года переиспользуется, пока БД не менялась
+                    if dataset is None or not dataset.is_current():
+                        self.messages.put(('progress', request_id, "Загрузка данных..."))
+                        dataset = ReportDataset(db, self.year)
+                    # Пока загружались данные, мог прийти новый запрос
+                    if self.is_cancelled(request_id):
+                        continue
+                    
+                    self.messages.put(('progress', request_id, "Формирование отчёта..."))
+                    text = build(dataset)
+                except Exception as e:
+                    self.messages.put(('error', request_id, str(e)))
+                else:
+                    if not self.is_cancelled(request_id):
+                        self.messages.put(('done', request_id, text))
+        finally:
+            db.close()
+    
+    def _next_request(self):
+        """
+        Следующий запрос: ждём первый, затем берём последний из накопившихся
+        (более ранние уже отменены новыми)
+        
+        Returns:
+            (номер, функция построения) или None для остановки
+        """
+        request = self.requests.get()
+        while request is not None:
+            try:
+                newer = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            request = newer
+        return request
+    
+    def _fail_requests(self, error: str):
+        """Отвечать ошибкой на все запросы до остановки (БД не открылась)"""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            self.messages.put(('error', request[0], error))
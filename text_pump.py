@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Вывод большого текста в виджет Text порциями
+
+Вставка многомегабайтного отчёта одним insert блокирует окно, пока Tk
+размечает весь текст. Здесь первая порция (примерно экран) вставляется
+сразу, остальные - из after(), между ними окно обрабатывает события.
+Порции режутся по концам строк.
+"""
+
+import tkinter as tk
+
+
+class TextPump:
+    """Порционная вставка текста в конец виджета Text"""
+    
+    # Размер первой порции (символов) - хватает на первый экран
+    FIRST_CHUNK_CHARS = 16 * 1024
+    
+    # Размер следующих порций (символов)
+    CHUNK_CHARS = 128 * 1024
+    
+    def __init__(self, text_widget):
+        """
+        Args:
+            text_widget: Виджет Text (ScrolledText); вне вставки может быть
+                         в состоянии 'disabled'
+        """
+        self.text_widget = text_widget
+        self._text = ""
+        self._position = 0
+        self._after_id = None
+    
+    @property
+    def running(self) -> bool:
+        """Остались невставленные порции"""
+        return self._position < len(self._text)
+    
+    def start(self, text: str):
+        """
+        Начать вывод текста (предыдущий вывод прерывается)
+        
+        Args:
+            text: Текст целиком
+        """
+        self.cancel()
+        self._text = text
+        self._position = 0
+        
+        self._insert_chunk(self.FIRST_CHUNK_CHARS)
+        # Отрисовываем первую порцию до возврата в цикл событий
+        self.text_widget.update_idletasks()
+        self._schedule()
+    
+    def finish(self):
+        """Вставить оставшийся текст сразу (например, перед сохранением в файл)"""
+        self._cancel_after()
+        if self.running:
+            self._insert_chunk(len(self._text))
+    
+    def cancel(self):
+        """Прервать вывод; вставленная часть остаётся в виджете"""
+        self._cancel_after()
+        self._text = ""
+        self._position = 0
+    
+    def _cancel_after(self):
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _schedule(self):
+        """Запланировать следующую порцию, если текст вставлен не весь"""
+        if self.running:
+            self._after_id = self.text_widget.after(1, self._pump)
+    
+    def _pump(self):
+        self._after_id = None
+        self._insert_chunk(self.CHUNK_CHARS)
+        self._schedule()
+    
+    def _insert_chunk(self, size: int):
+        """Вставить порцию не меньше size символов до конца строки"""
+        start = self._position
+        end = self._text.find('\n', start + size)
+        end = len(self._text) if end < 0 else end + 1
+        
+        state = self.text_widget.cget('state')
+        self.text_widget.config(state='normal')
+        self.text_widget.insert(tk.END, self._text[start:end])
+        self.text_widget.config(state=state)
+        self._position = end
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Виртуальный список строк для ttk.Treeview
+
+Treeview держит по одному элементу Tk на строку, поэтому на больших
+списках каждая фильтрация и сортировка платит за создание всех строк.
+Здесь модель хранит весь отфильтрованный и отсортированный список, а в
+таблице создаются только строки, попадающие в видимую область. Прокрутка
+(колесо мыши, полоса прокрутки, клавиши) сдвигает окно строк.
+"""
+
+from tkinter import ttk
+
+
+class VirtualList:
+    """Окно видимых строк Treeview над полным списком элементов"""
+    
+    # Строк за один шаг колеса мыши
+    WHEEL_ROWS = 3
+    
+    def __init__(self, tree, scrollbar, make_row, item_id, visible_rows: int = 15):
+        """
+        Подключить виртуальный список к таблице
+        
+        Args:
+            tree: ttk.Treeview (строки создаёт только этот класс)
+            scrollbar: Вертикальная ttk.Scrollbar таблицы
+            make_row: Функция элемент -> (id строки, значения колонок, теги);
+                      вызывается только для строк в видимой области
+            item_id: Функция элемент -> id строки (как в make_row), дешёвая -
+                     вызывается для всех элементов при set_items
+            visible_rows: Количество видимых строк до первого расчёта по размеру
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.make_row = make_row
+        self.item_id = item_id
+        self.visible_rows = visible_rows
+        
+        self.items = []  # Все элементы в порядке показа
+        self._item_ids = set()  # id строк всех элементов (для проверки выбора)
+        self.first = 0  # Индекс первой видимой строки
+        self._tree_rows = {}  # id строки в таблице -> (значения, теги)
+        self._selected = ()  # Выбранные строки (сохраняются при прокрутке)
+        # Выбор в таблице, выставленный самим списком при отрисовке: его
+        # <<TreeviewSelect>> - не действие пользователя
+        self._rendered_selection = ()
+        
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.bind('<Configure>', self._on_resize)
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda e: self._scroll_by(-self.WHEEL_ROWS))
+        tree.bind('<Button-5>', lambda e: self._scroll_by(self.WHEEL_ROWS))
+        tree.bind('<Up>', lambda e: self._on_arrow(-1))
+        tree.bind('<Down>', lambda e: self._on_arrow(1))
+        tree.bind('<Prior>', lambda e: self._scroll_by(-self.visible_rows))
+        tree.bind('<Next>', lambda e: self._scroll_by(self.visible_rows))
+    
+    def set_items(self, items: list):
+        """
+        Показать новый список элементов
+        
+        Позиция прокрутки сохраняется (в пределах нового списка), поэтому
+        после правки одного мероприятия таблица остаётся на том же месте.
+        """
+        self.items = items
+        self._item_ids = {self.item_id(item) for item in items}
+        self._render()
+    
+    def selected_ids(self) -> tuple:
+        """
+        Выбранные строки, включая ушедшие за видимую область
+        
+        tree.selection() содержит только отрисованные строки, поэтому
+        после прокрутки он пуст, хотя выбор сохраняется.
+        
+        Returns:
+            id строк (как в make_row), которые есть в текущем списке
+        """
+        return tuple(iid for iid in self._selected if iid in self._item_ids)
+    
+    def _render(self):
+        """Привести строки таблицы к видимому окну и обновить полосу прокрутки"""
+        total = len(self.items)
+        self.first = max(0, min(self.first, total - self.visible_rows))
+        
+        window = self.items[self.first:self.first + self.visible_rows]
+        self._reconcile([self.make_row(item) for item in window])
+        
+        # Выделение строк, вернувшихся в видимую область
+        visible_selection = [iid for iid in self._selected if iid in self._tree_rows]
+        self._rendered_selection = tuple(visible_selection)
+        if self._rendered_selection != tuple(self.tree.selection()):
+            self.tree.selection_set(visible_selection)
+        
+        if total > self.visible_rows:
+            self.scrollbar.set(self.first / total, (self.first + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _reconcile(self, rows: list):
+        """
+        Привести таблицу к списку строк, меняя только отличающиеся строки
+        
+        Строки таблицы идентифицируются id: лишние удаляются, новые
+        вставляются, у существующих обновляются изменившиеся значения
+        и позиция.
+        
+        Args:
+            rows: Строки в нужном порядке - кортежи (id строки, значения, теги)
+        """
+        wanted = {iid for iid, _, _ in rows}
+        existing = self.tree.get_children()
+        
+        stale = [iid for iid in existing if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._tree_rows[iid]
+        
+        # Оставшиеся строки в текущем порядке; next_index - первая ещё не
+        # размещённая из них (она уже стоит на позиции index)
+        current = [iid for iid in existing if iid in wanted]
+        placed = set()
+        next_index = 0
+        for index, (iid, values, tags) in enumerate(rows):
+            while next_index < len(current) and current[next_index] in placed:
+                next_index += 1
+            
+            if iid not in self._tree_rows:
+                self.tree.insert('', index, iid=iid, values=values, tags=tags)
+            else:
+                if self._tree_rows[iid] != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+                if next_index < len(current) and current[next_index] == iid:
+                    next_index += 1
+                else:
+                    self.tree.move(iid, '', index)
+            
+            self._tree_rows[iid] = (values, tags)
+            placed.add(iid)
+    
+    def _scroll_by(self, rows: int):
+        """Сдвинуть окно на rows строк (отрицательное значение - вверх)"""
+        first = self.first
+        self.first += rows
+        self._render()
+        if self.first != first:
+            self._restore_focus()
+        return "break"
+    
+    def _restore_focus(self):
+        """Оставить фокус клавиатуры на видимой строке"""
+        children = self.tree.get_children()
+        if children and self.tree.focus() not in children:
+            self.tree.focus(children[0])
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        """Обработчик полосы прокрутки (moveto / scroll)"""
+        if action == 'moveto':
+            self.first = int(float(value) * len(self.items))
+            self._render()
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self._scroll_by(int(value) * step)
+    
+    def _on_mousewheel(self, event):
+        """Колесо мыши (Windows, macOS)"""
+        return self._scroll_by(-self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS)
+    
+    def _on_arrow(self, direction: int):
+        """Стрелки вверх/вниз: на краю видимой области сдвигаем окно"""
+        children = self.tree.get_children()
+        if not children:
+            return "break"
+        
+        focus = self.tree.focus()
+        edge = children[0] if direction < 0 else children[-1]
+        if focus != edge:
+            return None  # Переход внутри окна - стандартная обработка Treeview
+        
+        # Индекс строки, на которую переходим, во всём списке
+        position = self.first + children.index(focus) + direction
+        if not 0 <= position < len(self.items):
+            return "break"
+        
+        self._scroll_by(direction)
+        iid = self.item_id(self.items[position])
+        self._selected = (iid,)
+        self.tree.focus(iid)
+        self.tree.selection_set(iid)
+        return "break"
+    
+    def _on_select(self, event=None):
+        """Запомнить выбор пользователя, чтобы вернуть его после прокрутки"""
+        selection = tuple(self.tree.selection())
+        # Выбор совпадает с выставленным при отрисовке - строки ушли за
+        # видимую область (или вернулись), прежний выбор сохраняем. Иначе
+        # выбор изменил пользователь, в том числе снял его совсем
+        if selection == self._rendered_selection:
+            return
+        self._selected = selection
+        self._rendered_selection = selection
+    
+    def _on_resize(self, event):
+        """Пересчитать количество видимых строк по высоте таблицы"""
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        if bbox:
+            # bbox первой строки: y - высота заголовка, h - высота строки
+            _, header_height, _, row_height = bbox
+        else:
+            # Строки ещё не отрисованы - высота строки из стиля, заголовок
+            # считаем не выше строки
+            style = self.tree.cget('style') or 'Treeview'
+            row_height = int(ttk.Style().lookup(style, 'rowheight') or 20)
+            header_height = row_height
+        visible_rows = max(1, (event.height - header_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self._render()
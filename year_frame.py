@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Колоночный снимок мероприятий года для агрегаций отчётов
+
+Строки года (один запрос get_events_by_year) раскладываются по колонкам:
+суммы - array('d'), вид спорта, тип, месяц, статус и квартал - коды
+в array('H') со словарями значений. Группировка с суммами по любой
+комбинации признаков выполняется одним проходом по колонкам; если
+установлен NumPy - через numpy.bincount.
+
+Фактические суммы считаются только для проведённых мероприятий (если факт
+не указан - берётся план), план для экономии/перерасхода - только для
+проведённых и отменённых. Правило применяется один раз при построении.
+Выгрузка отчёта по типам в CSV/HTML исторически считает нулевой факт
+не указанным - для неё отдельные показатели fact_*_nonzero.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    numpy = None
+    HAS_NUMPY = False
+
+
+# Месяц -> квартал (неизвестный месяц - первый квартал, как в get_quarter)
+MONTH_QUARTERS = {
+    'Январь': 1, 'Февраль': 1, 'Март': 1,
+    'Апрель': 2, 'Май': 2, 'Июнь': 2,
+    'Июль': 3, 'Август': 3, 'Сентябрь': 3,
+    'Октябрь': 4, 'Ноябрь': 4, 'Декабрь': 4
+}
+
+# Признаки группировки
+DIMENSIONS = ('sport', 'event_type', 'month', 'status', 'quarter')
+
+# Суммируемые показатели (count - количество мероприятий)
+MEASURES = ('count', 'plan_children', 'plan_trainers',
+            'plan_children_completed', 'plan_trainers_completed',
+            'fact_children', 'fact_trainers',
+            'fact_children_nonzero', 'fact_trainers_nonzero')
+
+# Статусы, для которых считается план экономии/перерасхода
+COMPLETED_STATUSES = ("Проведено", "Отменено")
+
+
+def empty_sums() -> Dict[str, float]:
+    """Нулевые суммы всех показателей (группа без мероприятий)"""
+    return dict.fromkeys(MEASURES, 0)
+
+
+class YearFrame:
+    """Мероприятия года в виде колонок: коды признаков и суммы"""
+    
+    def __init__(self, rows: Iterable[tuple]):
+        """
+        Разложить строки БД по колонкам
+        
+        Args:
+            rows: Строки в формате get_events_by_year
+        """
+        # Словари признаков: значения по кодам и коды по значениям
+        self.values: Dict[str, list] = {dim: [] for dim in DIMENSIONS}
+        self._codes: Dict[str, dict] = {dim: {} for dim in DIMENSIONS}
+        self.columns: Dict[str, array] = {dim: array('H') for dim in DIMENSIONS}
+        self.columns.update({measure: array('d') for measure in MEASURES})
+        self.columns['count'] = array('l')
+        
+        for row in rows:
+            sport, event_type, month = row[2], row[3], row[6]
+            children, trainers, status = row[7], row[9], row[11]
+            actual_children, actual_trainers = row[14], row[15]
+            
+            self._append_code('sport', sport)
+            self._append_code('event_type', event_type)
+            self._append_code('month', month)
+            self._append_code('status', status)
+            self._append_code('quarter', MONTH_QUARTERS.get(month, 1))
+            
+            completed = status in COMPLETED_STATUSES
+            conducted = status == "Проведено"
+            columns = self.columns
+            columns['count'].append(1)
+            columns['plan_children'].append(children)
+            columns['plan_trainers'].append(trainers)
+            columns['plan_children_completed'].append(children if completed else 0.0)
+            columns['plan_trainers_completed'].append(trainers if completed else 0.0)
+            if conducted:
+                columns['fact_children'].append(actual_children if actual_children is not None else children)
+                columns['fact_trainers'].append(actual_trainers if actual_trainers is not None else trainers)
+                columns['fact_children_nonzero'].append(actual_children or children)
+                columns['fact_trainers_nonzero'].append(actual_trainers or trainers)
+            else:
+                columns['fact_children'].append(0.0)
+                columns['fact_trainers'].append(0.0)
+                columns['fact_children_nonzero'].append(0.0)
+                columns['fact_trainers_nonzero'].append(0.0)
+    
+    def __len__(self) -> int:
+        return len(self.columns['count'])
+    
+    def _append_code(self, dim: str, value):
+        """Добавить код значения признака (новое значение получает следующий код)"""
+        codes = self._codes[dim]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.values[dim].append(value)
+        self.columns[dim].append(code)
+    
+    def group_sum(self, dims: Sequence[str] = (),
+                  measures: Sequence[str] = MEASURES) -> Dict[object, Dict[str, float]]:
+        """
+        Суммы показателей по группам
+        
+        Возвращаются только непустые группы, в порядке первого появления.
+        Суммы внутри группы накапливаются в порядке строк, как при
+        переборе мероприятий.
+        
+        Args:
+            dims: Признаки группировки (из DIMENSIONS); пустой - одна группа
+            measures: Показатели (из MEASURES)
+        
+        Returns:
+            Словарь {ключ группы: {показатель: сумма}}. Ключ - значение
+            признака для одного признака, кортеж значений для нескольких
+            и () без признаков
+        """
+        if not len(self):
+            return {}
+        if HAS_NUMPY:
+            groups = self._group_sum_numpy(dims, measures)
+        else:
+            groups = self._group_sum_python(dims, measures)
+        
+        result = {}
+        for codes, sums in groups:
+            key = tuple(self.values[dim][code] for dim, code in zip(dims, codes))
+            if len(dims) == 1:
+                key = key[0]
+            result[key] = dict(zip(measures, sums))
+        return result
+    
+    def _group_sum_python(self, dims, measures) -> List[Tuple[tuple, list]]:
+        """Группировка одним проходом по колонкам (без NumPy)"""
+        code_columns = [self.columns[dim] for dim in dims]
+        keys = zip(*code_columns) if code_columns else [()] * len(self)
+        
+        groups: Dict[tuple, list] = {}
+        for key, *row in zip(keys, *(self.columns[measure] for measure in measures)):
+            sums = groups.get(key)
+            if sums is None:
+                sums = groups[key] = [0] * len(measures)
+            for index, value in enumerate(row):
+                sums[index] += value
+        return list(groups.items())
+    
+    def _group_sum_numpy(self, dims, measures) -> List[Tuple[tuple, list]]:
+        """Группировка через numpy.bincount по составному коду группы"""
+        # Составной код: смешанная система счисления по размерам словарей
+        sizes = [len(self.values[dim]) for dim in dims]
+        group_codes = numpy.zeros(len(self), dtype=numpy.int64)
+        for dim, size in zip(dims, sizes):
+            group_codes = group_codes * size + numpy.frombuffer(self.columns[dim], dtype=numpy.uint16)
+        
+        # Группы в порядке первого появления (как в проходе без NumPy)
+        unique_codes, first_rows = numpy.unique(group_codes, return_index=True)
+        present = unique_codes[numpy.argsort(first_rows)]
+        sums = []
+        for measure in measures:
+            if measure == 'count':
+                sums.append(numpy.bincount(group_codes)[present].tolist())
+            else:
+                weights = numpy.frombuffer(self.columns[measure], dtype=numpy.float64)
+                sums.append(numpy.bincount(group_codes, weights=weights)[present].tolist())
+        
+        groups = []
+        for position, group_code in enumerate(present.tolist()):
+            codes = []
+            for size in reversed(sizes):
+                group_code, code = divmod(group_code, size)
+                codes.append(code)
+            groups.append((tuple(reversed(codes)), [column[position] for column in sums]))
+        return groups
+    
+    def totals(self) -> Dict[str, float]:
+        """Итоги по всему году (для пустого года - нули)"""
+        return self.group_sum(()).get((), empty_sums())